@@ -1,6 +1,8 @@
 // src/stores/children.js
 import { defineStore } from 'pinia'
-import api from '../utils/api'
+import api, { getAllPages } from '../utils/api'
+
+const CHART_MAX_POINTS = 120
 
 export const useChildrenStore = defineStore('children', {
   state: () => ({
@@ -8,6 +10,7 @@ export const useChildrenStore = defineStore('children', {
     selectedChild: null,
     vaccinations: {},
     growthRecords: {},
+    growthCharts: {},
     milestones: {},
     loading: false,
     error: null
@@ -22,6 +25,10 @@ export const useChildrenStore = defineStore('children', {
       return state.growthRecords[childId] || []
     },
 
+    getChildGrowthChart: (state) => (childId, indicator = 'wfa') => {
+      return state.growthCharts[childId]?.[indicator] || null
+    },
+
     getChildMilestones: (state) => (childId) => {
       return state.milestones[childId] || []
     },
@@ -121,6 +128,7 @@ export const useChildrenStore = defineStore('children', {
         // Remove associated vaccinations and growth records from state
         delete this.vaccinations[childId];
         delete this.growthRecords[childId];
+        delete this.growthCharts[childId];
         delete this.milestones[childId]; // Also remove milestones
 
         return true
@@ -135,8 +143,7 @@ export const useChildrenStore = defineStore('children', {
     async fetchChildVaccinations(childId) {
       try {
         // Assuming loading state for vaccinations if needed
-        const response = await api.get(`/children/${childId}/vaccinations`)
-        this.vaccinations[childId] = response.data
+        this.vaccinations[childId] = await getAllPages(`/children/${childId}/vaccinations`)
       } catch (error) {
         this.error = error.response?.data?.detail || 'Failed to fetch vaccinations'
       }
@@ -181,6 +188,28 @@ export const useChildrenStore = defineStore('children', {
       }
     },
 
+    async administerVaccinations(childId, administrations) {
+      try {
+        this.loading = true
+        this.error = null
+        // Every dose given at a visit in one request and one transaction
+        const response = await api.patch(`/children/${childId}/vaccinations`, {
+          vaccinations: administrations
+        })
+
+        const updated = new Map(response.data.map(v => [v.id, v]))
+        this.vaccinations[childId] = (this.vaccinations[childId] || []).map(
+          v => updated.get(v.id) || v
+        )
+        return true
+      } catch (error) {
+        this.error = error.response?.data?.detail || 'Failed to record vaccinations'
+        return false
+      } finally {
+        this.loading = false
+      }
+    },
+
     async deleteVaccination(childId, vaccinationId) {
       try {
         this.loading = true // Or specific loading state
@@ -206,13 +235,28 @@ export const useChildrenStore = defineStore('children', {
     async fetchChildGrowthRecords(childId) {
       try {
          // Assuming loading state for growth records if needed
-        const response = await api.get(`/children/${childId}/growth`)
-        this.growthRecords[childId] = response.data
+        this.growthRecords[childId] = await getAllPages(`/children/${childId}/growth`)
       } catch (error) {
         this.error = error.response?.data?.detail || 'Failed to fetch growth records'
       }
     },
 
+    async fetchChildGrowthChart(childId, indicator = 'wfa') {
+      try {
+        // Measurements and the matching WHO percentile bands in one request;
+        // long series are downsampled server-side to what the canvas can show
+        const response = await api.get(`/children/${childId}/growth/chart`, {
+          params: { indicator, max_points: CHART_MAX_POINTS }
+        })
+        this.growthCharts[childId] = {
+          ...this.growthCharts[childId],
+          [indicator]: response.data
+        }
+      } catch (error) {
+        this.error = error.response?.data?.detail || 'Failed to fetch growth chart'
+      }
+    },
+
     async createGrowthRecord(childId, growthData) {
       try {
         this.loading = true // Or specific loading state
@@ -305,6 +349,28 @@ export const useChildrenStore = defineStore('children', {
     },
 
 
+    async updateMilestones(childId, updates) {
+      try {
+        this.loading = true
+        this.error = null
+        // One request and one transaction for the whole batch
+        const response = await api.patch(`/children/${childId}/milestones`, {
+          milestones: updates
+        })
+
+        const updated = new Map(response.data.map(m => [m.id, m]))
+        this.milestones[childId] = (this.milestones[childId] || []).map(
+          m => updated.get(m.id) || m
+        )
+        return true
+      } catch (error) {
+        this.error = error.response?.data?.detail || 'Failed to update milestones'
+        return false
+      } finally {
+        this.loading = false
+      }
+    },
+
     setSelectedChild(child) {
       this.selectedChild = child
     },
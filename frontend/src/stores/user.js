@@ -43,6 +43,7 @@ export const useUserStore = defineStore('user', {
         
         this.token = response.data.access_token
         localStorage.setItem('token', this.token)
+        localStorage.setItem('refreshToken', response.data.refresh_token)
         this.isAuthenticated = true
         
         await this.fetchUserData()
@@ -139,10 +140,16 @@ export const useUserStore = defineStore('user', {
     },
 
     logout() {
+      const refreshToken = localStorage.getItem('refreshToken')
+      if (refreshToken) {
+        // Revoke server-side; the local sign-out does not wait for it
+        api.post('/auth/logout', { refresh_token: refreshToken }).catch(() => {})
+      }
       this.user = null
       this.isAuthenticated = false
       this.token = null
       localStorage.removeItem('token')
+      localStorage.removeItem('refreshToken')
     },
 
     clearError() {
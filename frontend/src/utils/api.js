@@ -26,17 +26,64 @@ api.interceptors.request.use(
   }
 )
 
+// Access tokens are short-lived; concurrent 401s share one refresh call
+let refreshPromise = null
+
+const refreshAccessToken = async () => {
+  const refreshToken = localStorage.getItem('refreshToken')
+  if (!refreshToken) {
+    throw new Error('No refresh token')
+  }
+  const response = await axios.post(`${API_BASE_URL}/auth/refresh`, {
+    refresh_token: refreshToken,
+  })
+  localStorage.setItem('token', response.data.access_token)
+  localStorage.setItem('refreshToken', response.data.refresh_token)
+  return response.data.access_token
+}
+
 // Response interceptor for error handling
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
-    if (error.response?.status === 401) {
+  async (error) => {
+    const request = error.config
+    const isAuthCall = request?.url?.startsWith('/auth/login') || request?.url?.startsWith('/auth/refresh')
+    if (error.response?.status === 401 && request && !request._retried && !isAuthCall) {
+      request._retried = true
+      try {
+        refreshPromise = refreshPromise || refreshAccessToken()
+        const token = await refreshPromise
+        request.headers.Authorization = `Bearer ${token}`
+        return api(request)
+      } catch (refreshError) {
+        // Refresh token expired or revoked; fall through to sign-out
+      } finally {
+        refreshPromise = null
+      }
+    }
+    if (error.response?.status === 401 && !request?.url?.startsWith('/auth/login')) {
       // Token expired or invalid
       localStorage.removeItem('token')
+      localStorage.removeItem('refreshToken')
       window.location.href = '/login'
     }
     return Promise.reject(error)
   }
 )
 
+// List endpoints return one page at a time; follow X-Next-Cursor for all of it
+export const getAllPages = async (url, config = {}) => {
+  const items = []
+  let cursor = null
+  do {
+    const response = await api.get(url, {
+      ...config,
+      params: { ...config.params, ...(cursor && { cursor }) }
+    })
+    items.push(...response.data)
+    cursor = response.headers['x-next-cursor']
+  } while (cursor)
+  return items
+}
+
 export default api
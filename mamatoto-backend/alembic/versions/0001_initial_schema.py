@@ -0,0 +1,215 @@
+"""initial schema
+
+Matches the tables previously created by Base.metadata.create_all. Tables
+that already exist are left alone, so databases created before migrations
+were introduced can simply be upgraded.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 11:38:56.767668
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    def create_table(name, *columns, indexes=()):
+        if name in existing:
+            return
+        op.create_table(name, *columns)
+        for index_name, index_columns, unique in indexes:
+            op.create_index(index_name, name, index_columns, unique=unique)
+
+    create_table('users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('first_name', sa.String(), nullable=True),
+        sa.Column('last_name', sa.String(), nullable=True),
+        sa.Column('phone', sa.String(), nullable=True),
+        sa.Column('location', sa.String(), nullable=True),
+        sa.Column('preferred_language', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        indexes=[('ix_users_email', ['email'], True), ('ix_users_id', ['id'], False)]
+    )
+    create_table('pregnancies',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column('current_week', sa.Integer(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('last_weight', sa.Float(), nullable=True),
+        sa.Column('last_checkup', sa.Date(), nullable=True),
+        sa.Column('complications', sa.Text(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        indexes=[('ix_pregnancies_id', ['id'], False)]
+    )
+    create_table('children',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('birth_date', sa.Date(), nullable=False),
+        sa.Column('gender', sa.Enum('male', 'female', 'other', name='genderenum'), nullable=True),
+        sa.Column('birth_weight', sa.Float(), nullable=True),
+        sa.Column('birth_length', sa.Float(), nullable=True),
+        sa.Column('birth_complications', sa.Text(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        indexes=[('ix_children_id', ['id'], False)]
+    )
+    create_table('appointments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('pregnancy_id', sa.Integer(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('appointment_type', sa.String(), nullable=False),
+        sa.Column('scheduled_date', sa.Date(), nullable=False),
+        sa.Column('completed', sa.Boolean(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('location', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['pregnancy_id'], ['pregnancies.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        indexes=[('ix_appointments_id', ['id'], False)]
+    )
+    create_table('vaccinations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('child_id', sa.Integer(), nullable=False),
+        sa.Column('vaccine_name', sa.String(), nullable=False),
+        sa.Column('vaccine_code', sa.String(), nullable=True),
+        sa.Column('scheduled_date', sa.Date(), nullable=False),
+        sa.Column('administered_date', sa.Date(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('batch_number', sa.String(), nullable=True),
+        sa.Column('healthcare_provider', sa.String(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['child_id'], ['children.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        indexes=[('ix_vaccinations_id', ['id'], False)]
+    )
+    create_table('growth_records',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('child_id', sa.Integer(), nullable=False),
+        sa.Column('recorded_date', sa.Date(), nullable=False),
+        sa.Column('age_months', sa.Integer(), nullable=True),
+        sa.Column('weight', sa.Float(), nullable=True),
+        sa.Column('height', sa.Float(), nullable=True),
+        sa.Column('head_circumference', sa.Float(), nullable=True),
+        sa.Column('weight_percentile', sa.Float(), nullable=True),
+        sa.Column('height_percentile', sa.Float(), nullable=True),
+        sa.Column('bmi', sa.Float(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['child_id'], ['children.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        indexes=[('ix_growth_records_id', ['id'], False)]
+    )
+    create_table('milestones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('child_id', sa.Integer(), nullable=False),
+        sa.Column('milestone_type', sa.String(), nullable=False),
+        sa.Column('milestone_name', sa.String(), nullable=False),
+        sa.Column('typical_age_months', sa.Integer(), nullable=True),
+        sa.Column('achieved_date', sa.Date(), nullable=True),
+        sa.Column('is_achieved', sa.Boolean(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['child_id'], ['children.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        indexes=[('ix_milestones_id', ['id'], False)]
+    )
+    create_table('health_records',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('child_id', sa.Integer(), nullable=True),
+        sa.Column('pregnancy_id', sa.Integer(), nullable=True),
+        sa.Column('record_type', sa.String(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('severity', sa.String(), nullable=True),
+        sa.Column('symptoms', sa.JSON(), nullable=True),
+        sa.Column('medications', sa.JSON(), nullable=True),
+        sa.Column('test_results', sa.JSON(), nullable=True),
+        sa.Column('action_taken', sa.Text(), nullable=True),
+        sa.Column('outcome', sa.Text(), nullable=True),
+        sa.Column('recorded_date', sa.Date(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['child_id'], ['children.id'], ),
+        sa.ForeignKeyConstraint(['pregnancy_id'], ['pregnancies.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        indexes=[('ix_health_records_id', ['id'], False)]
+    )
+    create_table('mental_health_assessments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('assessment_type', sa.String(), nullable=False),
+        sa.Column('score', sa.Integer(), nullable=True),
+        sa.Column('risk_level', sa.String(), nullable=True),
+        sa.Column('responses', sa.JSON(), nullable=True),
+        sa.Column('recommendations', sa.Text(), nullable=True),
+        sa.Column('assessment_date', sa.Date(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        indexes=[('ix_mental_health_assessments_id', ['id'], False)]
+    )
+    create_table('emergency_contacts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('relationship', sa.String(), nullable=True),
+        sa.Column('phone', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('is_primary', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        indexes=[('ix_emergency_contacts_id', ['id'], False)]
+    )
+    create_table('job_leases',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('owner', sa.String(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('job_leases')
+    op.drop_table('emergency_contacts')
+    op.drop_table('mental_health_assessments')
+    op.drop_table('health_records')
+    op.drop_table('milestones')
+    op.drop_table('growth_records')
+    op.drop_table('vaccinations')
+    op.drop_table('appointments')
+    op.drop_table('children')
+    op.drop_table('pregnancies')
+    op.drop_table('users')
@@ -0,0 +1,64 @@
+"""hot path indexes
+
+Composite indexes for the filters every router applies, plus partial
+indexes for open vaccinations and active pregnancies on dialects that
+support them (SQLite, PostgreSQL; elsewhere they become full indexes).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 11:52:10.104733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_VACCINATIONS = "status IN ('pending', 'overdue')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_pregnancies_user_id_is_active', 'pregnancies', ['user_id', 'is_active'])
+    op.create_index(
+        'ix_pregnancies_active_user_id', 'pregnancies', ['user_id'],
+        sqlite_where=sa.text('is_active = 1'), postgresql_where=sa.text('is_active')
+    )
+    op.create_index('ix_appointments_user_id_scheduled_date_completed', 'appointments',
+                    ['user_id', 'scheduled_date', 'completed'])
+    op.create_index('ix_children_user_id_is_active', 'children', ['user_id', 'is_active'])
+    op.create_index('ix_vaccinations_child_id_scheduled_date', 'vaccinations', ['child_id', 'scheduled_date'])
+    op.create_index('ix_vaccinations_status', 'vaccinations', ['status'])
+    op.create_index(
+        'ix_vaccinations_open_scheduled_date', 'vaccinations', ['scheduled_date'],
+        sqlite_where=sa.text(OPEN_VACCINATIONS), postgresql_where=sa.text(OPEN_VACCINATIONS)
+    )
+    op.create_index('ix_growth_records_child_id_recorded_date', 'growth_records', ['child_id', 'recorded_date'])
+    op.create_index('ix_milestones_child_id', 'milestones', ['child_id'])
+    op.create_index('ix_health_records_user_id_created_at', 'health_records', ['user_id', 'created_at'])
+    op.create_index('ix_mental_health_assessments_user_id_created_at', 'mental_health_assessments',
+                    ['user_id', 'created_at'])
+    op.create_index('ix_emergency_contacts_user_id', 'emergency_contacts', ['user_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_emergency_contacts_user_id', table_name='emergency_contacts')
+    op.drop_index('ix_mental_health_assessments_user_id_created_at', table_name='mental_health_assessments')
+    op.drop_index('ix_health_records_user_id_created_at', table_name='health_records')
+    op.drop_index('ix_milestones_child_id', table_name='milestones')
+    op.drop_index('ix_growth_records_child_id_recorded_date', table_name='growth_records')
+    op.drop_index('ix_vaccinations_open_scheduled_date', table_name='vaccinations')
+    op.drop_index('ix_vaccinations_status', table_name='vaccinations')
+    op.drop_index('ix_vaccinations_child_id_scheduled_date', table_name='vaccinations')
+    op.drop_index('ix_children_user_id_is_active', table_name='children')
+    op.drop_index('ix_appointments_user_id_scheduled_date_completed', table_name='appointments')
+    op.drop_index('ix_pregnancies_active_user_id', table_name='pregnancies')
+    op.drop_index('ix_pregnancies_user_id_is_active', table_name='pregnancies')
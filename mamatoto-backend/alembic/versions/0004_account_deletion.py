@@ -0,0 +1,39 @@
+"""account deletion
+
+users.deleted_at marks accounts whose data is waiting to be purged by
+app.jobs.account_purge, with a partial index for the purge job's scan.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 15:12:47.918203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING_DELETION = "deleted_at IS NOT NULL"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_users_pending_deletion', 'users', ['deleted_at'],
+        sqlite_where=sa.text(PENDING_DELETION), postgresql_where=sa.text(PENDING_DELETION)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_pending_deletion', table_name='users')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('deleted_at')
@@ -0,0 +1,45 @@
+"""who growth scores
+
+Age in days, WHO z-scores and the head circumference percentile on
+growth records. Existing rows keep their old percentiles until they are
+recomputed.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 16:02:19.553140
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NEW_COLUMNS = [
+    ('age_days', sa.Integer()),
+    ('head_circumference_percentile', sa.Float()),
+    ('weight_zscore', sa.Float()),
+    ('height_zscore', sa.Float()),
+    ('head_circumference_zscore', sa.Float()),
+    ('bmi_zscore', sa.Float()),
+    ('weight_for_length_zscore', sa.Float()),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, type_ in NEW_COLUMNS:
+        op.add_column('growth_records', sa.Column(name, type_, nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('growth_records') as batch_op:
+        for name, _ in reversed(NEW_COLUMNS):
+            batch_op.drop_column(name)
@@ -0,0 +1,41 @@
+"""milestone catalog
+
+Milestone rows seeded from the developmental milestone catalog record its
+code and version. The unique (child_id, catalog_code) index keeps seeding
+idempotent and replaces the plain child_id index.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 17:40:12.532187
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('milestones', sa.Column('catalog_code', sa.String(), nullable=True))
+    op.add_column('milestones', sa.Column('catalog_version', sa.String(), nullable=True))
+    op.create_index(
+        'ix_milestones_child_id_catalog_code', 'milestones', ['child_id', 'catalog_code'], unique=True
+    )
+    op.drop_index('ix_milestones_child_id', table_name='milestones')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_milestones_child_id', 'milestones', ['child_id'], unique=False)
+    op.drop_index('ix_milestones_child_id_catalog_code', table_name='milestones')
+    with op.batch_alter_table('milestones') as batch_op:
+        batch_op.drop_column('catalog_version')
+        batch_op.drop_column('catalog_code')
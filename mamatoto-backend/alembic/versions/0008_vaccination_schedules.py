@@ -0,0 +1,39 @@
+"""vaccination schedules
+
+Vaccinations planned from a versioned schedule record its id, so existing
+children can be moved to a new schedule. Rows created before schedules
+were versioned came from ke-kepi-v1.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 19:05:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('vaccinations', sa.Column('schedule_id', sa.String(), nullable=True))
+    op.execute(
+        "UPDATE vaccinations SET schedule_id = 'ke-kepi-v1' "
+        "WHERE vaccine_code IN ('BCG', 'OPV0', 'OPV1', 'PENTA1', 'PCV1', 'ROTA1', "
+        "'OPV2', 'PENTA2', 'PCV2', 'ROTA2', 'OPV3', 'PENTA3', 'PCV3', 'IPV', "
+        "'MR1', 'YF', 'MR2', 'DPT_BOOSTER')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('vaccinations') as batch_op:
+        batch_op.drop_column('schedule_id')
@@ -0,0 +1,36 @@
+"""foreign key indexes
+
+Index the optional child and pregnancy references of health records and
+appointments, so purging an account finds the rows that point at its
+children and pregnancies without scanning those tables.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 21:14:37.530216
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_health_records_child_id', 'health_records', ['child_id'])
+    op.create_index('ix_health_records_pregnancy_id', 'health_records', ['pregnancy_id'])
+    op.create_index('ix_appointments_pregnancy_id', 'appointments', ['pregnancy_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_appointments_pregnancy_id', table_name='appointments')
+    op.drop_index('ix_health_records_pregnancy_id', table_name='health_records')
+    op.drop_index('ix_health_records_child_id', table_name='health_records')
@@ -1,12 +1,32 @@
 # app/api/auth.py
-from fastapi import APIRouter, Depends, HTTPException, status
+"""
+Registration, login and token endpoints.
+
+Run ``python -m app.api.auth --benchmark 64 --url http://127.0.0.1:8000``
+against a running server (with rate limiting off) to time token issuance
+and refresh under concurrent load.
+"""
+import argparse
+import secrets
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from datetime import timedelta
+from datetime import datetime, timedelta
 from ..core.deps import get_db, get_current_user
-from ..core.security import verify_password, get_password_hash, create_access_token
-from ..models.user import User
-from ..schemas.user import UserCreate, UserResponse, UserUpdate, Token
+from ..core.cache import dashboard_cache, revoked_user_cache, user_cache
+from ..core.rate_limit import limit_login, limit_register
+from ..core.security import (
+    verify_password, verify_and_update_password, get_password_hash,
+    create_access_token, create_refresh_token, hash_refresh_token
+)
+from ..models.user import User, RefreshToken
+from ..jobs.account_purge import purge_deleted_account
+from ..schemas.user import UserCreate, UserResponse, UserUpdate, Token, RefreshRequest
 from ..config import settings
 from pydantic import BaseModel # Import BaseModel for Pydantic schemas
 
@@ -17,48 +37,130 @@ class ChangePasswordRequest(BaseModel):
     current_password: str
     new_password: str
 
-@router.post("/register", response_model=UserResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+@router.post("/register", response_model=UserResponse, dependencies=[Depends(limit_register)])
+async def register(user: UserCreate, db: Session = Depends(get_db)):
+    # The password endpoints are async so a request waiting for bcrypt holds
+    # no threadpool thread; their database work runs in the threadpool
+
+    def email_taken() -> bool:
+        taken = db.query(User.id).filter(User.email == user.email).first() is not None
+        # Return the connection to the pool while bcrypt runs
+        db.close()
+        return taken
+
     # Check if user already exists
-    db_user = db.query(User).filter(User.email == user.email).first()
-    if db_user:
+    if await run_in_threadpool(email_taken):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
     # Create new user
-    hashed_password = get_password_hash(user.password)
-    db_user = User(
-        email=user.email,
-        hashed_password=hashed_password,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        phone=user.phone,
-        location=user.location,
-        preferred_language=user.preferred_language
-    )
+    hashed_password = await get_password_hash(user.password)
 
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    def create_user() -> User:
+        db_user = User(
+            email=user.email,
+            hashed_password=hashed_password,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            phone=user.phone,
+            location=user.location,
+            preferred_language=user.preferred_language
+        )
+        db.add(db_user)
+        db.commit()
+        db.refresh(db_user)
+        return db_user
+
+    db_user = await run_in_threadpool(create_user)
+    # SQLite can hand a purged account's id to the next user
+    revoked_user_cache.invalidate(db_user.id)
     return db_user
 
-@router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+@router.post("/login", response_model=Token, dependencies=[Depends(limit_login)])
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    def load_user() -> Optional[User]:
+        user = db.query(User).filter(
+            User.email == form_data.username,
+            User.deleted_at.is_(None)
+        ).first()
+        # Return the connection to the pool while bcrypt runs; user stays loaded
+        db.close()
+        return user
+
+    user = await run_in_threadpool(load_user)
+    verified, new_hash = (
+        await verify_and_update_password(form_data.password, user.hashed_password)
+        if user else (False, None)
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(
-        subject=user.id, expires_delta=access_token_expires
+    def sign_in() -> dict:
+        # Upgrade hashes made with an older work factor while we have the password
+        if new_hash:
+            db.query(User).filter(User.id == user.id).update(
+                {"hashed_password": new_hash}
+            )
+            user_cache.invalidate(user.id)
+
+        # Drop this user's refresh tokens that can no longer be used
+        db.query(RefreshToken).filter(
+            RefreshToken.user_id == user.id,
+            RefreshToken.expires_at < datetime.utcnow()
+        ).delete(synchronize_session=False)
+
+        tokens = issue_tokens(db, user)
+        db.commit()
+        return tokens
+
+    return await run_in_threadpool(sign_in)
+
+@router.post("/refresh", response_model=Token)
+def refresh(request: RefreshRequest, db: Session = Depends(get_db)):
+    """Exchange a refresh token for a new access token and refresh token"""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
     )
-    return {"access_token": access_token, "token_type": "bearer"}
+
+    now = datetime.utcnow()
+    row = db.query(RefreshToken, User).join(User).filter(
+        RefreshToken.token_hash == hash_refresh_token(request.refresh_token)
+    ).first()
+    if row is None:
+        raise credentials_exception
+
+    stored, user = row
+    if stored.revoked_at is not None:
+        # A rotated token was presented again, so it has leaked: revoke the
+        # whole family rather than guess which holder is legitimate
+        revoke_refresh_tokens(db, user.id)
+        db.commit()
+        raise credentials_exception
+    if stored.expires_at <= now:
+        raise credentials_exception
+
+    stored.revoked_at = now
+    tokens = issue_tokens(db, user)
+    db.commit()
+    return tokens
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(request: RefreshRequest, db: Session = Depends(get_db)):
+    db.query(RefreshToken).filter(
+        RefreshToken.token_hash == hash_refresh_token(request.refresh_token),
+        RefreshToken.revoked_at.is_(None)
+    ).update({"revoked_at": datetime.utcnow()}, synchronize_session=False)
+    db.commit()
+
+    return # No content for 204
 
 @router.get("/me", response_model=UserResponse)
 def read_current_user(current_user: User = Depends(get_current_user)):
@@ -70,42 +172,162 @@ def update_current_user(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    # current_user is a shared read-only snapshot; update a session-bound copy
+    user = db.query(User).filter(User.id == current_user.id).first()
     for field, value in user_update.dict(exclude_unset=True).items():
-        setattr(current_user, field, value)
+        setattr(user, field, value)
 
     db.commit()
-    db.refresh(current_user)
-    return current_user
+    user_cache.invalidate(user.id)
+    dashboard_cache.invalidate(user.id)
+    db.refresh(user)
+    return user
 
 @router.put("/change-password", status_code=status.HTTP_200_OK)
-def change_password(
+async def change_password(
     password_data: ChangePasswordRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    # Return the connection to the pool while bcrypt runs
+    await run_in_threadpool(db.close)
+
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    if not await verify_password(password_data.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password"
         )
 
     # Hash the new password and update
-    hashed_password = get_password_hash(password_data.new_password)
-    current_user.hashed_password = hashed_password
+    hashed_password = await get_password_hash(password_data.new_password)
 
-    db.commit()
+    def update_password():
+        db.query(User).filter(User.id == current_user.id).update(
+            {"hashed_password": hashed_password}
+        )
+        # Sessions started with the old password have to sign in again
+        revoke_refresh_tokens(db, current_user.id)
+        db.commit()
+
+    await run_in_threadpool(update_password)
+    user_cache.invalidate(current_user.id)
+    dashboard_cache.invalidate(current_user.id)
     # db.refresh(current_user) # Not strictly necessary after password change
 
     return {"message": "Password updated successfully"}
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 def delete_account(
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    # Delete the user
-    db.delete(current_user)
+    user_id = current_user.id
+
+    # Mark the account as deleted and purge its rows after the response;
+    # the purge job also retries any account left marked. The email is
+    # released now so it can register again before the purge has run.
+    db.query(User).filter(User.id == user_id).update({
+        "deleted_at": datetime.utcnow(),
+        "is_active": False,
+        "email": f"deleted-{user_id}-{secrets.token_hex(8)}@deleted.invalid",
+    })
+    revoke_refresh_tokens(db, user_id)
     db.commit()
+    user_cache.invalidate(user_id)
+    revoked_user_cache.set(user_id, True)
+    dashboard_cache.invalidate(user_id)
+    background_tasks.add_task(purge_deleted_account, user_id)
 
     return # No content for 204
+
+# Helper functions
+def issue_tokens(db: Session, user: User) -> dict:
+    """
+    Short-lived access token carrying the claims read-only endpoints need,
+    plus a refresh token stored server-side; the caller commits
+    """
+    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+    access_token = create_access_token(
+        subject=user.id,
+        expires_delta=access_token_expires,
+        claims={"lang": user.preferred_language, "active": bool(user.is_active)}
+    )
+
+    refresh_token = create_refresh_token()
+    db.add(RefreshToken(
+        user_id=user.id,
+        token_hash=hash_refresh_token(refresh_token),
+        expires_at=datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days)
+    ))
+
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+        "expires_in": int(access_token_expires.total_seconds())
+    }
+
+def revoke_refresh_tokens(db: Session, user_id: int) -> None:
+    db.query(RefreshToken).filter(
+        RefreshToken.user_id == user_id,
+        RefreshToken.revoked_at.is_(None)
+    ).update({"revoked_at": datetime.utcnow()}, synchronize_session=False)
+
+def _timed_burst(function, items, concurrency: int):
+    """Run function over items on concurrency threads; (seconds, status counts)"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        statuses = Counter(pool.map(function, items))
+    return time.perf_counter() - start, statuses
+
+def main(argv=None):
+    import httpx
+
+    parser = argparse.ArgumentParser(description="Benchmark token issuance and refresh")
+    parser.add_argument("--benchmark", type=int, default=64, metavar="N",
+                        help="Logins, refreshes and claims-only reads sent in each burst")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Requests in flight at once (default N)")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Server to benchmark")
+    parser.add_argument("--email", default="token-benchmark@example.com")
+    parser.add_argument("--password", default="Benchmark-passw0rd")
+    args = parser.parse_args(argv)
+    n = args.benchmark
+    concurrency = args.concurrency or n
+
+    with httpx.Client(base_url=args.url, timeout=120) as client:
+        # 400 when the account exists from an earlier run
+        client.post("/auth/register", json={"email": args.email, "password": args.password})
+        credentials = {"username": args.email, "password": args.password}
+        tokens = []
+
+        def login(_):
+            response = client.post("/auth/login", data=credentials)
+            if response.status_code == 200:
+                tokens.append(response.json())
+            return response.status_code
+
+        def refresh(token):
+            response = client.post("/auth/refresh", json={"refresh_token": token["refresh_token"]})
+            return response.status_code
+
+        def read(token):
+            headers = {"Authorization": f"Bearer {token['access_token']}"}
+            return client.get("/children/", headers=headers).status_code
+
+        seconds, statuses = _timed_burst(login, range(n), concurrency)
+        print(f"{n} logins in {seconds:.2f} s ({n / seconds:.1f}/s): {dict(statuses)}")
+        if not tokens:
+            return
+        issued = (tokens * (n // len(tokens) + 1))[:n]
+        seconds, statuses = _timed_burst(read, issued, concurrency)
+        print(f"{n} claims-only GET /children/ in {seconds:.2f} s ({n / seconds:.1f}/s): {dict(statuses)}")
+        # Each refresh token rotates once; repeats would revoke the family
+        seconds, statuses = _timed_burst(refresh, tokens, concurrency)
+        print(f"{len(tokens)} refreshes in {seconds:.2f} s ({len(tokens) / seconds:.1f}/s): "
+              f"{dict(statuses)}")
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,55 @@
 # app/api/child.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response
+from sqlalchemy import insert, or_, select, update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List, Optional, Set
+from itertools import groupby
+import json
 from datetime import date, timedelta
-from ..core.deps import get_db, get_current_user
+import numpy as np
+from ..config import settings
+from ..core.deps import get_db, get_current_user, get_current_identity
+from ..core.cache import dashboard_cache, growth_analytics_cache
+from ..core.pagination import PageParams, page_params, paginate
+from ..core.streaming import stream_rows, streaming_media_type
 from ..models.user import User
+from ..schemas.user import TokenData
 from ..models.child import Child, Vaccination, GrowthRecord, Milestone
 from ..schemas.child import (
-    ChildCreate, ChildResponse, ChildUpdate,
-    VaccinationCreate, VaccinationResponse, VaccinationUpdate,
+    ChildCreate, ChildBulkCreate, ChildResponse, ChildUpdate,
+    VaccinationCreate, VaccinationResponse, VaccinationUpdate, VaccinationBatchUpdate,
+    VaccinationPlanItem, VaccinationPlanResponse, ClinicPlanEntry,
     GrowthRecordCreate, GrowthRecordResponse,
-    MilestoneCreate, MilestoneResponse, MilestoneUpdate
+    GrowthAnalyticsPoint, GrowthAnalyticsResponse, GrowthTrajectory,
+    MilestoneResponse, MilestoneUpdate, MilestoneBatchUpdate
+)
+from ..utils.vaccination import VACCINATION_STATUSES, build_vaccination_rows, get_vaccination_status
+from ..utils.vaccination_schedule import (
+    COMPLETED, NOT_ELIGIBLE, PLAN_STATUSES, VaccinationSchedule,
+    administered_matrix, get_schedule, to_date
+)
+from ..utils.growth import (
+    CROSSING_LINES, calculate_percentiles, age_in_months, analyze_growth_series,
+    latest_growth_signals, get_growth_alerts, get_trajectory_alerts
+)
+from ..utils.growth_reference import (
+    CHART_COLUMNS, PERCENTILE_ZSCORES, get_reference_curve, indicator_steps
+)
+from ..utils.downsample import downsample_indices
+from ..utils.growth_standards import LENGTH_MAX_AGE_DAYS
+from ..utils.milestones import (
+    MILESTONE_STATUSES, age_in_fractional_months, build_milestone_rows,
+    get_milestone_catalog, get_milestone_status
 )
-from ..utils.vaccination import get_vaccination_schedule
-from ..utils.growth import calculate_percentiles
 
 router = APIRouter(prefix="/children", tags=["children"])
 
+# Plan statuses of doses still to give
+OPEN_PLAN_STATUSES = ("upcoming", "due", "catch_up")
+CLINIC_PLAN_DEFAULT_DAYS = 28
+CLINIC_PLAN_MAX_DAYS = 366
+
 @router.post("/", response_model=ChildResponse)
 def create_child(
     child: ChildCreate,
@@ -33,33 +66,54 @@ def create_child(
         birth_complications=child.birth_complications
     )
     
+    # Child, vaccination schedule and milestones are written in one transaction
     db.add(db_child)
+    db.flush()
+    insert_vaccination_schedules(db, [db_child])
+    insert_milestones(db, [db_child])
     db.commit()
+    dashboard_cache.invalidate(current_user.id)
     db.refresh(db_child)
     
     # Calculate age and add to response
     age_days = (date.today() - db_child.birth_date).days
     db_child.age_months = age_days // 30
     
-    # Create vaccination schedule
-    vaccination_schedule = get_vaccination_schedule()
-    for vaccine_info in vaccination_schedule:
-        scheduled_date = db_child.birth_date + timedelta(days=vaccine_info["days_from_birth"])
-        vaccination = Vaccination(
-            child_id=db_child.id,
-            vaccine_name=vaccine_info["name"],
-            vaccine_code=vaccine_info["code"],
-            scheduled_date=scheduled_date,
-            status="pending"
-        )
-        db.add(vaccination)
+    return db_child
+
+@router.post("/bulk", response_model=List[ChildResponse])
+def create_children_bulk(
+    bulk: ChildBulkCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Register many children at once, e.g. a clinic's newborns for the day"""
+    # One multi-row INSERT ... RETURNING for the children, one executemany
+    # INSERT each for all of their vaccination schedules and milestones.
+    # Rows come back in request order, so responses match the request.
+    db_children = db.scalars(
+        insert(Child).returning(Child, sort_by_parameter_order=True),
+        [
+            dict(child.dict(), user_id=current_user.id)
+            for child in bulk.children
+        ]
+    ).all()
+    insert_vaccination_schedules(db, db_children)
+    insert_milestones(db, db_children)
+    
+    # Build responses before commit expires the inserted children
+    today = date.today()
+    for db_child in db_children:
+        db_child.age_months = (today - db_child.birth_date).days // 30
+    children = [ChildResponse.model_validate(db_child) for db_child in db_children]
     
     db.commit()
-    return db_child
+    dashboard_cache.invalidate(current_user.id)
+    return children
 
 @router.get("/", response_model=List[ChildResponse])
 def get_children(
-    current_user: User = Depends(get_current_user),
+    current_user: TokenData = Depends(get_current_identity),
     db: Session = Depends(get_db)
 ):
     children = db.query(Child).filter(
@@ -74,10 +128,62 @@ def get_children(
     
     return children
 
+@router.get("/vaccinations/plan", response_model=List[ClinicPlanEntry])
+def get_vaccination_clinic_plan(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    current_user: TokenData = Depends(get_current_identity),
+    db: Session = Depends(get_db)
+):
+    """
+    Doses to give between start and end (by default the next four weeks)
+    across all of the user's children, by due date; catch-up doses that are
+    already late are due today
+    """
+    today = date.today()
+    start = start or today
+    end = end or start + timedelta(days=CLINIC_PLAN_DEFAULT_DAYS)
+    if end < start or (end - start).days > CLINIC_PLAN_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"end must be after start and at most {CLINIC_PLAN_MAX_DAYS} days later"
+        )
+    
+    # Plain rows rather than ORM objects; clinics can have thousands of children
+    children = db.query(Child.id, Child.name, Child.birth_date).filter(
+        Child.user_id == current_user.id,
+        Child.is_active == True
+    ).all()
+    vaccinations = db.query(
+        Vaccination.id, Vaccination.child_id, Vaccination.vaccine_code, Vaccination.status,
+        Vaccination.administered_date, Vaccination.schedule_id
+    ).join(Child, Vaccination.child_id == Child.id).filter(
+        Child.user_id == current_user.id,
+        Child.is_active == True
+    ).all()
+    
+    start_ordinal, end_ordinal = start.toordinal(), end.toordinal()
+    entries = []
+    for schedule, group, plan, stored in plan_vaccinations(children, vaccinations, today):
+        wanted = (
+            (plan["status"] != COMPLETED) & (plan["status"] != NOT_ELIGIBLE)
+            & (plan["due"] >= start_ordinal) & (plan["due"] <= end_ordinal)
+        )
+        for row, position in zip(*np.nonzero(wanted)):
+            child = group[row]
+            vaccination = stored.get((child.id, schedule.doses[position].code))
+            item = vaccination_plan_item(schedule, plan, row, position, vaccination)
+            if item.status in OPEN_PLAN_STATUSES:
+                entries.append(ClinicPlanEntry(
+                    child_id=child.id, child_name=child.name, **item.model_dump()
+                ))
+    entries.sort(key=lambda entry: (entry.due_date, entry.child_name, entry.child_id))
+    return entries
+
 @router.get("/{child_id}", response_model=ChildResponse)
 def get_child(
     child_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenData = Depends(get_current_identity),
     db: Session = Depends(get_db)
 ):
     child = db.query(Child).filter(
@@ -118,6 +224,8 @@ def update_child(
         setattr(child, field, value)
     
     db.commit()
+    dashboard_cache.invalidate(current_user.id)
+    growth_analytics_cache.invalidate((current_user.id, child_id))
     db.refresh(child)
     return child
 
@@ -154,15 +262,89 @@ def create_vaccination(
     
     db.add(db_vaccination)
     db.commit()
+    dashboard_cache.invalidate(current_user.id)
     db.refresh(db_vaccination)
     return db_vaccination
 
 @router.get("/{child_id}/vaccinations", response_model=List[VaccinationResponse])
 def get_child_vaccinations(
     child_id: int,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    current_user: TokenData = Depends(get_current_identity),
+    db: Session = Depends(get_db)
+):
+    # Verify child belongs to current user
+    child = db.query(Child).filter(
+        Child.id == child_id,
+        Child.user_id == current_user.id
+    ).first()
+    
+    if not child:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Child not found"
+        )
+    
+    media_type = streaming_media_type(request)
+    if media_type:
+        today = date.today()
+        return stream_rows(
+            select(*Vaccination.__table__.columns).where(
+                Vaccination.child_id == child_id
+            ).order_by(Vaccination.scheduled_date, Vaccination.id),
+            VaccinationResponse, media_type, f"child_{child_id}_vaccinations",
+            prepare=lambda row: dict(row._mapping, status=get_vaccination_status(row, today))
+        )
+    
+    query = db.query(Vaccination).filter(Vaccination.child_id == child_id)
+    vaccinations = paginate(query, page, response, Vaccination.scheduled_date, Vaccination.id)
+    return vaccination_responses(vaccinations)
+
+@router.put("/{child_id}/vaccinations/{vaccination_id}", response_model=VaccinationResponse)
+def update_vaccination(
+    child_id: int,
+    vaccination_id: int,
+    vaccination_update: VaccinationUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    vaccination = db.query(Vaccination).join(Child, Vaccination.child_id == Child.id).filter(
+        Vaccination.id == vaccination_id,
+        Vaccination.child_id == child_id,
+        Child.user_id == current_user.id
+    ).first()
+    
+    if not vaccination:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Vaccination not found"
+        )
+    
+    changes = vaccination_changes(
+        vaccination_update.dict(exclude_unset=True), vaccination.administered_date, date.today()
+    )
+    for field, value in changes.items():
+        setattr(vaccination, field, value)
+    
+    db.commit()
+    dashboard_cache.invalidate(current_user.id)
+    db.refresh(vaccination)
+    return vaccination_responses([vaccination])[0]
+
+@router.patch("/{child_id}/vaccinations", response_model=List[VaccinationResponse])
+def administer_vaccinations(
+    child_id: int,
+    batch: VaccinationBatchUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Record every dose given (or skipped) at one visit in one transaction.
+    Doses are named by id or by vaccine code; either all of them are
+    updated or, if any cannot be found, none is.
+    """
     # Verify child belongs to current user
     child = db.query(Child).filter(
         Child.id == child_id,
@@ -175,18 +357,113 @@ def get_child_vaccinations(
             detail="Child not found"
         )
     
-    vaccinations = db.query(Vaccination).filter(
-        Vaccination.child_id == child_id
-    ).order_by(Vaccination.scheduled_date).all()
+    if any(item.id is None and item.vaccine_code is None for item in batch.vaccinations):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each vaccination needs an id or a vaccine_code"
+        )
     
-    # Update overdue status
-    for vaccination in vaccinations:
-        if (vaccination.status == "pending" and 
-            vaccination.scheduled_date < date.today() - timedelta(days=30)):
-            vaccination.status = "overdue"
+    ids = [item.id for item in batch.vaccinations if item.id is not None]
+    codes = [item.vaccine_code for item in batch.vaccinations if item.id is None]
+    stored = db.query(
+        Vaccination.id, Vaccination.vaccine_code, Vaccination.administered_date,
+        Vaccination.batch_number, Vaccination.healthcare_provider, Vaccination.notes
+    ).filter(
+        Vaccination.child_id == child_id,
+        or_(Vaccination.id.in_(ids), Vaccination.vaccine_code.in_(codes))
+    ).order_by(
+        # A code names the child's earliest dose of it still to give
+        Vaccination.administered_date.isnot(None), Vaccination.scheduled_date, Vaccination.id
+    ).all()
+    by_id = {row.id: row for row in stored}
+    by_code = {}
+    for row in stored:
+        by_code.setdefault(row.vaccine_code, row)
     
+    rows = [
+        by_id.get(item.id) if item.id is not None else by_code.get(item.vaccine_code)
+        for item in batch.vaccinations
+    ]
+    missing = [
+        item.id if item.id is not None else item.vaccine_code
+        for item, row in zip(batch.vaccinations, rows) if row is None
+    ]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Vaccinations not found: {missing}"
+        )
+    resolved = [row.id for row in rows]
+    if len(set(resolved)) != len(resolved):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each vaccination may only be listed once"
+        )
+    
+    # One executemany UPDATE by primary key per status; every row of a group
+    # sets the same columns, keeping stored values the request leaves out
+    today = date.today()
+    groups: Dict[str, List[Dict]] = {}
+    for item, row in zip(batch.vaccinations, rows):
+        given = item.model_dump(
+            include={"administered_date", "batch_number", "healthcare_provider", "notes"},
+            exclude_unset=True
+        )
+        changes = vaccination_changes(dict(given, status=item.status.value), row.administered_date, today)
+        groups.setdefault(item.status.value, []).append(dict(
+            {
+                field: getattr(row, field)
+                for field in ("batch_number", "healthcare_provider", "notes")
+            },
+            **changes,
+            id=row.id
+        ))
+    for group in groups.values():
+        db.execute(update(Vaccination), group)
     db.commit()
-    return vaccinations
+    dashboard_cache.invalidate(current_user.id)
+    
+    vaccinations = db.query(Vaccination).filter(
+        Vaccination.id.in_(resolved)
+    ).order_by(Vaccination.scheduled_date, Vaccination.id).all()
+    return vaccination_responses(vaccinations)
+
+@router.get("/{child_id}/vaccinations/plan", response_model=VaccinationPlanResponse)
+def get_child_vaccination_plan(
+    child_id: int,
+    current_user: TokenData = Depends(get_current_identity),
+    db: Session = Depends(get_db)
+):
+    """
+    Every dose of the child's schedule with its next due date. Missed doses
+    are planned from today (catch-up) and the rest of their series moves
+    back to keep the minimum intervals.
+    """
+    # Verify child belongs to current user
+    child = db.query(Child).filter(
+        Child.id == child_id,
+        Child.user_id == current_user.id
+    ).first()
+    
+    if not child:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Child not found"
+        )
+    
+    vaccinations = db.query(Vaccination).filter(Vaccination.child_id == child_id).all()
+    (schedule, _, plan, stored), = plan_vaccinations([child], vaccinations, date.today())
+    doses = [
+        vaccination_plan_item(schedule, plan, 0, position, stored.get((child_id, dose.code)))
+        for position, dose in enumerate(schedule.doses)
+    ]
+    open_dates = [item.due_date for item in doses if item.status in OPEN_PLAN_STATUSES]
+    return VaccinationPlanResponse(
+        child_id=child_id,
+        schedule_id=schedule.schedule_id,
+        next_due_date=min(open_dates, default=None),
+        doses=sorted(doses, key=lambda item: (item.due_date, item.series, item.dose))
+    )
 
 @router.post("/{child_id}/growth", response_model=GrowthRecordResponse)
 def create_growth_record(
@@ -209,40 +486,176 @@ def create_growth_record(
     
     # Calculate age at recording
     age_days = (growth_record.recorded_date - child.birth_date).days
-    age_months = age_days // 30
     
-    # Calculate percentiles using WHO standards
-    percentiles = calculate_percentiles(
-        age_months=age_months,
+    # Z-scores and percentiles from the WHO growth standards
+    scores = calculate_percentiles(
+        age_days=age_days,
         weight=growth_record.weight,
         height=growth_record.height,
-        gender=child.gender.value if child.gender else "unknown"
+        head_circumference=growth_record.head_circumference,
+        gender=child.gender.value if child.gender else None
     )
     
     db_growth_record = GrowthRecord(
         child_id=child_id,
         recorded_date=growth_record.recorded_date,
-        age_months=age_months,
+        age_months=age_in_months(age_days),
+        age_days=age_days,
         weight=growth_record.weight,
         height=growth_record.height,
         head_circumference=growth_record.head_circumference,
-        weight_percentile=percentiles.get("weight_percentile"),
-        height_percentile=percentiles.get("height_percentile"),
-        bmi=percentiles.get("bmi"),
-        notes=growth_record.notes
+        notes=growth_record.notes,
+        **scores
     )
     
     db.add(db_growth_record)
     db.commit()
+    dashboard_cache.invalidate(current_user.id)
+    growth_analytics_cache.invalidate((current_user.id, child_id))
     db.refresh(db_growth_record)
     return db_growth_record
 
 @router.get("/{child_id}/growth", response_model=List[GrowthRecordResponse])
 def get_child_growth_records(
     child_id: int,
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    max_points: Optional[int] = Query(None, ge=3),
+    page: PageParams = Depends(page_params),
+    current_user: TokenData = Depends(get_current_identity),
+    db: Session = Depends(get_db)
+):
+    """
+    The child's growth records by date, one page at a time (see
+    X-Next-Cursor). With max_points the whole series is returned instead,
+    downsampled to about that many records (Largest-Triangle-Three-Buckets
+    over weight, height and head circumference); records with a percentile
+    crossing, faltering or percentile alert are always included. With
+    Accept: application/x-ndjson or text/csv, every record as a stream.
+    """
+    media_type = streaming_media_type(request)
+    if max_points is not None and (page.cursor is not None or media_type):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="max_points returns a downsampled JSON list and cannot be combined "
+                   "with cursor or a streaming Accept type"
+        )
+    
+    # Verify child belongs to current user
+    child = db.query(Child).filter(
+        Child.id == child_id,
+        Child.user_id == current_user.id
+    ).first()
+    
+    if not child:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Child not found"
+        )
+    
+    if media_type:
+        return stream_rows(
+            select(*GrowthRecord.__table__.columns).where(
+                GrowthRecord.child_id == child_id
+            ).order_by(GrowthRecord.recorded_date, GrowthRecord.id),
+            GrowthRecordResponse, media_type, f"child_{child_id}_growth_records"
+        )
+    
+    query = db.query(GrowthRecord).filter(GrowthRecord.child_id == child_id)
+    if max_points is None:
+        return paginate(query, page, response, GrowthRecord.recorded_date, GrowthRecord.id)
+    
+    growth_records = query.order_by(GrowthRecord.recorded_date, GrowthRecord.id).all()
+    if len(growth_records) <= max_points:
+        return growth_records
+    
+    # A cached entry built from another worker's view of the series is rebuilt
+    analytics = growth_analytics_cache.get((current_user.id, child_id))
+    if analytics is None or [point.growth_record_id for point in analytics.points] != [
+        record.id for record in growth_records
+    ]:
+        analytics = build_growth_analytics(child_id, child.birth_date, growth_records)
+        growth_analytics_cache.set((current_user.id, child_id), analytics)
+    flagged = flagged_growth_record_ids(analytics)
+    
+    keep = [
+        record.id in flagged or bool(get_growth_alerts(
+            record.age_months, record.weight_percentile, record.height_percentile
+        ))
+        for record in growth_records
+    ]
+    indices = downsample_indices(
+        record_age_days(child.birth_date, growth_records),
+        [[record.weight, record.height, record.head_circumference] for record in growth_records],
+        max_points, keep
+    )
+    return [growth_records[index] for index in indices]
+
+@router.get("/{child_id}/growth/analytics", response_model=GrowthAnalyticsResponse)
+def get_child_growth_analytics(
+    child_id: int,
+    current_user: TokenData = Depends(get_current_identity),
+    db: Session = Depends(get_db)
+):
+    """
+    Velocity, z-score changes, percentile-line crossings and faltering
+    flags over the child's whole growth series. Cached per child for a few
+    minutes, or until a growth record is added.
+    """
+    cached = growth_analytics_cache.get((current_user.id, child_id))
+    if cached is not None:
+        return cached
+    
+    # Verify child belongs to current user
+    child = db.query(Child).filter(
+        Child.id == child_id,
+        Child.user_id == current_user.id
+    ).first()
+    
+    if not child:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Child not found"
+        )
+    
+    analytics = compute_growth_analytics(db, [child])[child_id]
+    growth_analytics_cache.set((current_user.id, child_id), analytics)
+    return analytics
+
+@router.get("/{child_id}/growth/chart")
+def get_child_growth_chart(
+    child_id: int,
+    indicator: str = "wfa",
+    step: Optional[float] = None,
+    max_points: Optional[int] = Query(None, ge=3),
+    current_user: TokenData = Depends(get_current_identity),
     db: Session = Depends(get_db)
 ):
+    """
+    The child's measurements for one WHO indicator together with the
+    reference bands of their sex (null when the standards do not apply),
+    in one payload:
+
+        {"child_id": 1, "indicator": "wfa", "points": [...], "reference": {...}}
+
+    The reference is the same precomputed document GET
+    /growth/reference/{indicator}/{sex} serves, spliced in as it is.
+    max_points downsamples the points as GET /children/{id}/growth does,
+    keeping flagged visits and those outside the P3-P97 band.
+    """
+    if indicator not in CHART_COLUMNS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown growth indicator, use one of {list(CHART_COLUMNS)}"
+        )
+    if step is not None and not any(
+        abs(step - configured) < 1e-9 for configured in indicator_steps(indicator)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported step, use one of {indicator_steps(indicator)}"
+        )
+
     # Verify child belongs to current user
     child = db.query(Child).filter(
         Child.id == child_id,
@@ -255,8 +668,399 @@ def get_child_growth_records(
             detail="Child not found"
         )
     
-    growth_records = db.query(GrowthRecord).filter(
+    x_column, y_column, zscore_column = CHART_COLUMNS[indicator]
+    records = db.query(
+        GrowthRecord.id, GrowthRecord.recorded_date, GrowthRecord.age_days,
+        getattr(GrowthRecord, x_column).label("x"),
+        getattr(GrowthRecord, y_column).label("y"),
+        getattr(GrowthRecord, zscore_column).label("zscore")
+    ).filter(
         GrowthRecord.child_id == child_id
-    ).order_by(GrowthRecord.recorded_date).all()
+    ).order_by(GrowthRecord.recorded_date, GrowthRecord.id).all()
+    
+    points = []
+    for record in records:
+        age_days = record.age_days
+        if age_days is None:
+            # Recorded before ages were stored in days
+            age_days = (record.recorded_date - child.birth_date).days
+        x = age_days if x_column == "age_days" else record.x
+        if x is None or record.y is None:
+            continue
+        if indicator == "wfl" and age_days > LENGTH_MAX_AGE_DAYS:
+            continue  # scored against weight-for-height
+        if indicator == "wfh" and age_days <= LENGTH_MAX_AGE_DAYS:
+            continue  # scored against weight-for-length
+        points.append({
+            "id": record.id,
+            "recorded_date": record.recorded_date.isoformat(),
+            "x": x,
+            "y": record.y,
+            "zscore": record.zscore
+        })
+    
+    if max_points is not None and len(points) > max_points:
+        flagged = flagged_growth_record_ids(
+            get_growth_analytics(db, current_user.id, [child])[child_id]
+        )
+        outer_line = PERCENTILE_ZSCORES[97]
+        keep = [
+            point["id"] in flagged
+            or (point["zscore"] is not None and abs(point["zscore"]) >= outer_line)
+            for point in points
+        ]
+        indices = downsample_indices(
+            [point["x"] for point in points], [point["y"] for point in points], max_points, keep
+        )
+        points = [points[index] for index in indices]
+    
+    curve = get_reference_curve(indicator, child.gender.value if child.gender else "", step)
+    body = b"".join((
+        b'{"child_id":', str(child_id).encode(),
+        b',"indicator":', json.dumps(indicator).encode(),
+        b',"points":', json.dumps(points, separators=(",", ":")).encode(),
+        b',"reference":', curve.body if curve else b"null",
+        b"}"
+    ))
+    return Response(content=body, media_type="application/json")
+
+@router.get("/{child_id}/milestones", response_model=List[MilestoneResponse])
+def get_child_milestones(
+    child_id: int,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    current_user: TokenData = Depends(get_current_identity),
+    db: Session = Depends(get_db)
+):
+    """
+    The child's milestones by typical age, each with its status at the
+    child's current age; ?status=due (or overdue, upcoming, achieved)
+    returns only those
+    """
+    if status_filter is not None and status_filter not in MILESTONE_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown milestone status, use one of {list(MILESTONE_STATUSES)}"
+        )
+    
+    # Verify child belongs to current user
+    child = db.query(Child).filter(
+        Child.id == child_id,
+        Child.user_id == current_user.id
+    ).first()
+    
+    if not child:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Child not found"
+        )
+    
+    milestones = db.query(Milestone).filter(
+        Milestone.child_id == child_id
+    ).order_by(Milestone.typical_age_months, Milestone.id).all()
+    
+    responses = milestone_responses(child, milestones)
+    if status_filter is not None:
+        responses = [response for response in responses if response.status == status_filter]
+    return responses
+
+@router.put("/{child_id}/milestones/{milestone_id}", response_model=MilestoneResponse)
+def update_milestone(
+    child_id: int,
+    milestone_id: int,
+    milestone_update: MilestoneUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    milestone = db.query(Milestone).join(Child, Milestone.child_id == Child.id).filter(
+        Milestone.id == milestone_id,
+        Milestone.child_id == child_id,
+        Child.user_id == current_user.id
+    ).first()
+    
+    if not milestone:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Milestone not found"
+        )
+    
+    changes = milestone_changes(milestone_update, milestone.achieved_date, date.today())
+    for field, value in changes.items():
+        setattr(milestone, field, value)
     
-    return growth_records
\ No newline at end of file
+    db.commit()
+    db.refresh(milestone)
+    return milestone_responses(milestone.child, [milestone])[0]
+
+@router.patch("/{child_id}/milestones", response_model=List[MilestoneResponse])
+def update_milestones_batch(
+    child_id: int,
+    batch: MilestoneBatchUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Update many of a child's milestones in one transaction, e.g. everything
+    a health worker ticked off during a visit. Either every listed milestone
+    is updated or, if any is not the child's, none is.
+    """
+    # Verify child belongs to current user
+    child = db.query(Child).filter(
+        Child.id == child_id,
+        Child.user_id == current_user.id
+    ).first()
+    
+    if not child:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Child not found"
+        )
+    
+    ids = [item.id for item in batch.milestones]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each milestone may only be listed once"
+        )
+    
+    achieved_dates = dict(db.query(Milestone.id, Milestone.achieved_date).filter(
+        Milestone.id.in_(ids),
+        Milestone.child_id == child_id
+    ).all())
+    missing = [milestone_id for milestone_id in ids if milestone_id not in achieved_dates]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Milestones not found: {missing}"
+        )
+    
+    # One executemany UPDATE by primary key for the whole batch
+    today = date.today()
+    rows = [
+        dict(milestone_changes(item, achieved_dates[item.id], today), id=item.id)
+        for item in batch.milestones
+    ]
+    rows = [row for row in rows if len(row) > 1]
+    if rows:
+        db.execute(update(Milestone), rows)
+    db.commit()
+    
+    milestones = db.query(Milestone).filter(
+        Milestone.id.in_(ids)
+    ).order_by(Milestone.typical_age_months, Milestone.id).all()
+    return milestone_responses(child, milestones)
+
+# Helper functions
+def insert_milestones(db: Session, children: List[Child]) -> None:
+    """Seed the catalog milestones of flushed children with one executemany INSERT"""
+    catalog = get_milestone_catalog()
+    rows = [
+        row
+        for child in children
+        for row in build_milestone_rows(child.id, catalog)
+    ]
+    if rows:
+        db.execute(insert(Milestone), rows)
+
+def milestone_responses(child: Child, milestones: List[Milestone]) -> List[MilestoneResponse]:
+    """Milestones with their status at the child's current age, computed at read time"""
+    catalog = get_milestone_catalog()
+    age_months = age_in_fractional_months(child.birth_date, date.today())
+    return [
+        MilestoneResponse.model_validate(milestone).model_copy(
+            update={"status": get_milestone_status(milestone, age_months, catalog)}
+        )
+        for milestone in milestones
+    ]
+
+def milestone_changes(milestone_update: MilestoneUpdate, achieved_date: Optional[date],
+                      today: date) -> Dict:
+    """
+    Column values for an update. Giving an achieved date marks the
+    milestone achieved; marking it achieved without one records today,
+    and marking it not achieved clears the date.
+    """
+    changes = milestone_update.dict(exclude_unset=True)
+    if changes.get("achieved_date") is not None:
+        changes.setdefault("is_achieved", True)
+    if changes.get("is_achieved") is True and not (changes.get("achieved_date") or achieved_date):
+        changes["achieved_date"] = today
+    if changes.get("is_achieved") is False and "achieved_date" not in changes:
+        changes["achieved_date"] = None
+    return changes
+
+def get_growth_analytics(
+    db: Session, user_id: int, children: List[Child]
+) -> Dict[int, GrowthAnalyticsResponse]:
+    """Growth analytics of several children of a user, computing only those not cached"""
+    analytics = {}
+    missing = []
+    for child in children:
+        cached = growth_analytics_cache.get((user_id, child.id))
+        if cached is None:
+            missing.append(child)
+        else:
+            analytics[child.id] = cached
+    
+    if missing:
+        for child_id, result in compute_growth_analytics(db, missing).items():
+            growth_analytics_cache.set((user_id, child_id), result)
+            analytics[child_id] = result
+    return analytics
+
+def compute_growth_analytics(db: Session, children: List[Child]) -> Dict[int, GrowthAnalyticsResponse]:
+    """Analyze the growth series of every child from a single query"""
+    birth_dates = {child.id: child.birth_date for child in children}
+    records = db.query(
+        GrowthRecord.id, GrowthRecord.child_id, GrowthRecord.recorded_date,
+        GrowthRecord.age_days, GrowthRecord.age_months,
+        GrowthRecord.weight, GrowthRecord.height,
+        GrowthRecord.weight_zscore, GrowthRecord.height_zscore,
+        GrowthRecord.weight_percentile, GrowthRecord.height_percentile
+    ).filter(
+        GrowthRecord.child_id.in_(list(birth_dates))
+    ).order_by(GrowthRecord.child_id, GrowthRecord.recorded_date, GrowthRecord.id).all()
+    
+    series_by_child = {
+        child_id: list(rows) for child_id, rows in groupby(records, key=lambda row: row.child_id)
+    }
+    return {
+        child_id: build_growth_analytics(child_id, birth_date, series_by_child.get(child_id, []))
+        for child_id, birth_date in birth_dates.items()
+    }
+
+def flagged_growth_record_ids(analytics: GrowthAnalyticsResponse) -> Set[int]:
+    """Records where growth faltered or crossed two percentile lines since the last visit"""
+    return {
+        point.growth_record_id
+        for point in analytics.points
+        if point.faltering
+        or abs(point.weight_lines_crossed or 0) >= CROSSING_LINES
+        or abs(point.height_lines_crossed or 0) >= CROSSING_LINES
+    }
+
+def record_age_days(birth_date: date, records: List) -> List[int]:
+    return [
+        record.age_days if record.age_days is not None
+        else (record.recorded_date - birth_date).days
+        for record in records
+    ]
+
+def build_growth_analytics(child_id: int, birth_date: date, records: List) -> GrowthAnalyticsResponse:
+    if not records:
+        return GrowthAnalyticsResponse(child_id=child_id, points=[], latest=GrowthTrajectory())
+    
+    age_days = record_age_days(birth_date, records)
+    weights = [record.weight for record in records]
+    series = analyze_growth_series(
+        age_days, weights, [record.height for record in records],
+        [record.weight_zscore for record in records],
+        [record.height_zscore for record in records]
+    )
+    
+    names = list(series)
+    columns = [series[name].tolist() for name in names]
+    points = [
+        GrowthAnalyticsPoint(
+            growth_record_id=record.id,
+            recorded_date=record.recorded_date,
+            age_days=age,
+            **{name: None if value != value else value for name, value in zip(names, values)}  # NaN -> None
+        )
+        for record, age, *values in zip(records, age_days, *columns)
+    ]
+    
+    latest = latest_growth_signals(series, weights)
+    last = records[-1]
+    alerts = get_growth_alerts(
+        last.age_months, last.weight_percentile, last.height_percentile
+    ) + get_trajectory_alerts(latest)
+    return GrowthAnalyticsResponse(
+        child_id=child_id,
+        points=points,
+        latest=GrowthTrajectory(**latest),
+        alerts=alerts
+    )
+
+def vaccination_responses(vaccinations: List[Vaccination]) -> List[VaccinationResponse]:
+    """Status is computed at read time; persisted status only changes on writes"""
+    today = date.today()
+    return [
+        VaccinationResponse.model_validate(vaccination).model_copy(
+            update={"status": get_vaccination_status(vaccination, today)}
+        )
+        for vaccination in vaccinations
+    ]
+
+def vaccination_changes(changes: Dict, administered_date: Optional[date], today: date) -> Dict:
+    """
+    Column values for an update. Giving an administered date marks the dose
+    completed; marking it completed without one records today, and marking
+    it skipped or pending clears the date.
+    """
+    changes = dict(changes)
+    if changes.get("status") is not None and changes["status"] not in VACCINATION_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown vaccination status, use one of {list(VACCINATION_STATUSES)}"
+        )
+    if changes.get("administered_date") is not None:
+        changes.setdefault("status", "completed")
+    if changes.get("status") == "completed":
+        changes["administered_date"] = changes.get("administered_date") or administered_date or today
+    elif changes.get("status") in ("pending", "skipped"):
+        changes["administered_date"] = None
+    return changes
+
+def plan_vaccinations(children: List, vaccinations: List, today: date):
+    """
+    Plan the schedules of many children (rows with id and birth_date) at once. Children are grouped by the
+    schedule their doses were planned from (the configured one for children
+    without any); yields (schedule, children, plan, stored) per group, where
+    stored maps (child_id, vaccine_code) to the vaccination row.
+    """
+    stored = {(vaccination.child_id, vaccination.vaccine_code): vaccination for vaccination in vaccinations}
+    schedule_ids = {
+        vaccination.child_id: vaccination.schedule_id
+        for vaccination in vaccinations if vaccination.schedule_id
+    }
+    groups: Dict[str, List] = {}
+    for child in children:
+        groups.setdefault(schedule_ids.get(child.id, settings.vaccination_schedule), []).append(child)
+    
+    for schedule_id, group in groups.items():
+        schedule = get_schedule(schedule_id)
+        child_ids = [child.id for child in group]
+        plan = schedule.plan(
+            [child.birth_date.toordinal() for child in group],
+            administered_matrix(schedule, child_ids, vaccinations),
+            today.toordinal()
+        )
+        yield schedule, group, plan, stored
+
+def vaccination_plan_item(schedule: VaccinationSchedule, plan: Dict, row: int, position: int,
+                          vaccination) -> VaccinationPlanItem:
+    dose = schedule.doses[position]
+    skipped = vaccination is not None and vaccination.status == "skipped"
+    return VaccinationPlanItem(
+        vaccination_id=vaccination.id if vaccination else None,
+        vaccine_code=dose.code,
+        vaccine_name=dose.name,
+        series=dose.series,
+        dose=dose.dose,
+        scheduled_date=to_date(plan["scheduled"][row, position]),
+        earliest_date=to_date(plan["earliest"][row, position]),
+        due_date=to_date(plan["due"][row, position]),
+        status="skipped" if skipped else PLAN_STATUSES[plan["status"][row, position]],
+        administered_date=vaccination.administered_date if vaccination else None
+    )
+
+def insert_vaccination_schedules(db: Session, children: List[Child]) -> None:
+    """
+    Insert the vaccination schedule of flushed children with a single
+    executemany INSERT instead of one ORM object per dose
+    """
+    rows = build_vaccination_rows(
+        [child.id for child in children], [child.birth_date for child in children]
+    )
+    if rows:
+        db.execute(insert(Vaccination), rows)
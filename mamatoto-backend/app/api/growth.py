@@ -0,0 +1,48 @@
+# app/api/growth.py
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import Response
+from typing import Optional
+from ..config import settings
+from ..utils.growth_reference import ReferenceCurve, get_reference_curve, indicator_steps
+from ..utils.growth_standards import INDICATORS, SEXES
+
+router = APIRouter(prefix="/growth", tags=["growth"])
+
+@router.get("/reference/{indicator}/{sex}")
+def get_growth_reference(
+    indicator: str,
+    sex: str,
+    request: Request,
+    step: Optional[float] = None
+):
+    """
+    P3/P15/P50/P85/P97 curves of a WHO indicator (wfa, lhfa, hcfa, bmi,
+    wfl, wfh) for "male" or "female", one point every step days (cm for
+    wfl and wfh).
+    The curves are precomputed, so clients and proxies may cache them and
+    revalidate with If-None-Match.
+    """
+    if indicator not in INDICATORS or sex not in SEXES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Growth reference not found"
+        )
+
+    curve = get_reference_curve(indicator, sex, step)
+    if curve is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported step, use one of {indicator_steps(indicator)}"
+        )
+
+    return cached_curve_response(curve, request)
+
+def cached_curve_response(curve: ReferenceCurve, request: Request) -> Response:
+    headers = {
+        "ETag": curve.etag,
+        "Cache-Control": f"public, max-age={settings.growth_reference_max_age_seconds}",
+    }
+    if_none_match = request.headers.get("if-none-match", "")
+    if curve.etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=curve.body, media_type="application/json", headers=headers)
@@ -1,10 +1,15 @@
 # app/api/health.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import date
-from ..core.deps import get_db, get_current_user
+from ..core.deps import get_db, get_current_user, get_current_identity
+from ..core.cache import dashboard_cache
+from ..core.pagination import PageParams, page_params, paginate
+from ..core.streaming import stream_rows, streaming_media_type
 from ..models.user import User
+from ..schemas.user import TokenData
 from ..models.health import HealthRecord, MentalHealthAssessment, EmergencyContact
 from ..schemas.health import (
     HealthRecordCreate, HealthRecordResponse,
@@ -39,24 +44,40 @@ def create_health_record(
     
     db.add(db_record)
     db.commit()
+    dashboard_cache.invalidate(current_user.id)
     db.refresh(db_record)
     return db_record
 
 @router.get("/records", response_model=List[HealthRecordResponse])
 def get_health_records(
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    current_user: TokenData = Depends(get_current_identity),
     db: Session = Depends(get_db)
 ):
-    records = db.query(HealthRecord).filter(
-        HealthRecord.user_id == current_user.id
-    ).order_by(HealthRecord.created_at.desc()).all()
+    """
+    Newest first, one page at a time; see X-Next-Cursor. With Accept:
+    application/x-ndjson or text/csv, all of them as a stream.
+    """
+    media_type = streaming_media_type(request)
+    if media_type:
+        return stream_rows(
+            select(*HealthRecord.__table__.columns).where(
+                HealthRecord.user_id == current_user.id
+            ).order_by(HealthRecord.created_at.desc(), HealthRecord.id.desc()),
+            HealthRecordResponse, media_type, "health_records"
+        )
     
-    return records
+    query = db.query(HealthRecord).filter(HealthRecord.user_id == current_user.id)
+    return paginate(
+        query, page, response, HealthRecord.created_at, HealthRecord.id, descending=True
+    )
 
 @router.get("/records/{record_id}", response_model=HealthRecordResponse)
 def get_health_record(
     record_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenData = Depends(get_current_identity),
     db: Session = Depends(get_db)
 ):
     record = db.query(HealthRecord).filter(
@@ -96,19 +117,25 @@ def create_mental_health_assessment(
     
     db.add(db_assessment)
     db.commit()
+    dashboard_cache.invalidate(current_user.id)
     db.refresh(db_assessment)
     return db_assessment
 
 @router.get("/mental-health", response_model=List[MentalHealthAssessmentResponse])
 def get_mental_health_assessments(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    page: PageParams = Depends(page_params),
+    current_user: TokenData = Depends(get_current_identity),
     db: Session = Depends(get_db)
 ):
-    assessments = db.query(MentalHealthAssessment).filter(
+    """Newest first, one page at a time; see X-Next-Cursor"""
+    query = db.query(MentalHealthAssessment).filter(
         MentalHealthAssessment.user_id == current_user.id
-    ).order_by(MentalHealthAssessment.created_at.desc()).all()
-    
-    return assessments
+    )
+    return paginate(
+        query, page, response,
+        MentalHealthAssessment.created_at, MentalHealthAssessment.id, descending=True
+    )
 
 # Emergency Contacts
 @router.post("/emergency-contacts", response_model=EmergencyContactResponse)
@@ -135,12 +162,13 @@ def create_emergency_contact(
     
     db.add(db_contact)
     db.commit()
+    dashboard_cache.invalidate(current_user.id)
     db.refresh(db_contact)
     return db_contact
 
 @router.get("/emergency-contacts", response_model=List[EmergencyContactResponse])
 def get_emergency_contacts(
-    current_user: User = Depends(get_current_user),
+    current_user: TokenData = Depends(get_current_identity),
     db: Session = Depends(get_db)
 ):
     contacts = db.query(EmergencyContact).filter(
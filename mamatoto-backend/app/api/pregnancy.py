@@ -1,10 +1,15 @@
 # app/api/pregnancy.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import date, timedelta
-from ..core.deps import get_db, get_current_user
+from ..core.deps import get_db, get_current_user, get_current_identity
+from ..core.cache import dashboard_cache
+from ..core.pagination import PageParams, page_params, paginate
+from ..core.streaming import stream_rows, streaming_media_type
 from ..models.user import User
+from ..schemas.user import TokenData
 from ..models.pregnancy import Pregnancy, Appointment
 from ..schemas.pregnancy import (
     PregnancyCreate, PregnancyResponse, PregnancyUpdate,
@@ -43,6 +48,7 @@ def create_pregnancy(
     
     db.add(db_pregnancy)
     db.commit()
+    dashboard_cache.invalidate(current_user.id)
     db.refresh(db_pregnancy)
     
     # Calculate additional fields
@@ -54,12 +60,16 @@ def create_pregnancy(
 
 @router.get("/", response_model=List[PregnancyResponse])
 def get_pregnancies(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    page: PageParams = Depends(page_params),
+    current_user: TokenData = Depends(get_current_identity),
     db: Session = Depends(get_db)
 ):
-    pregnancies = db.query(Pregnancy).filter(
-        Pregnancy.user_id == current_user.id
-    ).order_by(Pregnancy.created_at.desc()).all()
+    """Newest first, one page at a time; see X-Next-Cursor"""
+    query = db.query(Pregnancy).filter(Pregnancy.user_id == current_user.id)
+    pregnancies = paginate(
+        query, page, response, Pregnancy.created_at, Pregnancy.id, descending=True
+    )
     
     # Add calculated fields
     for pregnancy in pregnancies:
@@ -72,7 +82,7 @@ def get_pregnancies(
 
 @router.get("/active", response_model=PregnancyResponse)
 def get_active_pregnancy(
-    current_user: User = Depends(get_current_user),
+    current_user: TokenData = Depends(get_current_identity),
     db: Session = Depends(get_db)
 ):
     pregnancy = db.query(Pregnancy).filter(
@@ -115,6 +125,7 @@ def update_pregnancy(
         setattr(pregnancy, field, value)
     
     db.commit()
+    dashboard_cache.invalidate(current_user.id)
     db.refresh(pregnancy)
     return pregnancy
 
@@ -135,16 +146,30 @@ def create_appointment(
     
     db.add(db_appointment)
     db.commit()
+    dashboard_cache.invalidate(current_user.id)
     db.refresh(db_appointment)
     return db_appointment
 
 @router.get("/appointments", response_model=List[AppointmentResponse])
 def get_appointments(
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    current_user: TokenData = Depends(get_current_identity),
     db: Session = Depends(get_db)
 ):
-    appointments = db.query(Appointment).filter(
-        Appointment.user_id == current_user.id
-    ).order_by(Appointment.scheduled_date).all()
+    """
+    By date, one page at a time; see X-Next-Cursor. With Accept:
+    application/x-ndjson or text/csv, all of them as a stream.
+    """
+    media_type = streaming_media_type(request)
+    if media_type:
+        return stream_rows(
+            select(*Appointment.__table__.columns).where(
+                Appointment.user_id == current_user.id
+            ).order_by(Appointment.scheduled_date, Appointment.id),
+            AppointmentResponse, media_type, "appointments"
+        )
     
-    return appointments
\ No newline at end of file
+    query = db.query(Appointment).filter(Appointment.user_id == current_user.id)
+    return paginate(query, page, response, Appointment.scheduled_date, Appointment.id)
\ No newline at end of file
@@ -1,21 +1,92 @@
 # app/config.py
 import os
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite:///./mamatoto.db"
+    check_schema_on_startup: bool = True  # Refuse to start unless at the latest migration
+    db_async: bool = False  # Serve routes through AsyncSession (see app/core/async_routes.py)
+    async_database_url: str = ""  # Derived from database_url when empty
+    
+    # Connection pool (ignored for in-memory SQLite)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30  # seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # seconds before a connection is replaced
+    db_pool_pre_ping: bool = True
+    
+    # SQLite profile, applied on every new connection
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 268435456  # 256 MB
+    sqlite_cache_size: int = -64000  # negative = KiB, i.e. ~64 MB per connection
     
     # Security
     secret_key: str = "your-super-secret-key-change-this-in-production"
     algorithm: str = "HS256"
-    access_token_expire_minutes: int = 1440  # 24 hours
+    # Tokens are signed with secret_key under jwt_key_id. To rotate, move the
+    # old secret into jwt_previous_keys (JSON, kid -> secret) and set a new
+    # secret_key and jwt_key_id; tokens signed with either keep working.
+    jwt_key_id: str = "default"
+    jwt_previous_keys: Dict[str, str] = {}
+    token_cache_max_entries: int = 10000
+    access_token_expire_minutes: int = 15  # clients renew via /auth/refresh
+    refresh_token_expire_days: int = 30
+    bcrypt_rounds: int = 12  # existing hashes are upgraded on next login
+    password_hash_workers: int = 2  # processes; 0 hashes inline in the request thread
+    password_hash_max_queue: int = 32  # waiting hashes before answering 503
+    
+    # Rate limiting of /auth/login and /auth/register (token buckets)
+    rate_limit_enabled: bool = True
+    rate_limit_ip_burst: int = 20
+    rate_limit_ip_per_minute: float = 20
+    rate_limit_email_burst: int = 5
+    rate_limit_email_per_minute: float = 5
+    rate_limit_max_entries: int = 100000  # in-memory buckets per worker
+    rate_limit_sqlite_path: str = ""  # shared store for all workers; empty keeps buckets in memory
+    
+    # Pagination of list endpoints (?limit=&cursor=)
+    page_size_default: int = 50
+    page_size_max: int = 500
+    stream_batch_size: int = 1000  # rows per fetch of NDJSON/CSV exports
+    
+    # GET /metrics answers only requests bearing this token; empty hides it (404)
+    metrics_token: str = ""
     
     # API
     api_title: str = "Mamatoto API"
     api_version: str = "1.0.0"
     api_description: str = "Maternal and Child Health Platform API"
     
+    # Caching
+    dashboard_cache_ttl_seconds: int = 300
+    dashboard_cache_max_entries: int = 1024
+    user_cache_ttl_seconds: int = 60  # bounds staleness across workers
+    user_cache_max_entries: int = 10000
+    growth_analytics_cache_ttl_seconds: int = 300  # bounds staleness across workers and recompute runs
+    growth_analytics_cache_max_entries: int = 10000
+    
+    # Growth reference curves (GET /growth/reference), built once at startup
+    growth_reference_age_steps: List[float] = [7, 1, 30]  # days between points; the first is the default
+    growth_reference_length_steps: List[float] = [0.5, 0.1, 1.0]  # cm, for weight-for-length
+    growth_reference_max_age_seconds: int = 604800  # Cache-Control max-age
+    
+    # Developmental milestones
+    milestone_catalog_version: str = "v1"  # app/data/milestones/<version>.csv
+    
+    # Vaccination schedule of new children; app/data/vaccination/<id>.csv
+    vaccination_schedule: str = "ke-kepi-v1"
+    
+    # Background jobs
+    vaccination_sweep_interval_seconds: int = 3600  # 0 disables the in-process scheduler
+    vaccination_sweep_batch_size: int = 500
+    job_lease_seconds: int = 300
+    account_purge_interval_seconds: int = 600  # retries purges of deleted accounts; 0 disables
+    account_purge_wait_seconds: float = 10  # a purge queued by DELETE /auth/me waits this long for a running one
+    
     # CORS
     allowed_origins: list = ["http://localhost:3000","https://3000-firebase-mamatotogit-1753969026312.cluster-64pjnskmlbaxowh5lzq6i7v4ra.cloudworkstations.dev", "http://localhost:5173"]
     
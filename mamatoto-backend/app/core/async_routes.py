@@ -0,0 +1,114 @@
+"""
+Async variants of the sync routes, selected with settings.db_async.
+
+Every sync route that depends on get_db is re-registered as an async route
+with the same path, parameters and response model, but backed by an
+AsyncSession. The original endpoint body runs through
+AsyncSession.run_sync, so its SQL goes through the async driver on the
+event loop instead of occupying a threadpool thread, and both modes share
+one implementation that can be benchmarked side by side.
+
+run_sync executes the whole endpoint on the event loop, CPU work
+included, so routes that do CPU-heavy work stay sync and keep running in
+the threadpool: password hashing under /auth, and the growth scoring,
+analytics, downsampling and vaccination planning routes below.
+"""
+import inspect
+from typing import Callable
+from fastapi import APIRouter, Depends
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import Response
+from .deps import get_current_user, get_current_user_async
+from ..database import get_db, get_async_db
+
+SYNC_ONLY_PREFIXES = ("/auth",)
+SYNC_ONLY_PATHS = frozenset({
+    "/children/bulk",
+    "/children/vaccinations/plan",
+    "/children/{child_id}/vaccinations/plan",
+    "/children/{child_id}/growth",
+    "/children/{child_id}/growth/analytics",
+    "/children/{child_id}/growth/chart",
+})
+
+def _dependency(parameter: inspect.Parameter):
+    return getattr(parameter.default, "dependency", None)
+
+def is_async_candidate(route) -> bool:
+    return (
+        isinstance(route, APIRoute)
+        and not inspect.iscoroutinefunction(route.endpoint)
+        and not route.path.startswith(SYNC_ONLY_PREFIXES)
+        and route.path not in SYNC_ONLY_PATHS
+        and any(
+            _dependency(parameter) is get_db
+            for parameter in inspect.signature(route.endpoint).parameters.values()
+        )
+    )
+
+def make_async_endpoint(route: APIRoute) -> Callable:
+    """Wrap a sync endpoint so it runs on an AsyncSession via run_sync"""
+    endpoint = route.endpoint
+    signature = inspect.signature(endpoint)
+    adapter = TypeAdapter(route.response_model) if route.response_model else None
+
+    db_parameter = None
+    parameters = []
+    for parameter in signature.parameters.values():
+        dependency = _dependency(parameter)
+        if dependency is get_db:
+            db_parameter = parameter.name
+            parameter = parameter.replace(default=Depends(get_async_db), annotation=AsyncSession)
+        elif dependency is get_current_user:
+            parameter = parameter.replace(default=Depends(get_current_user_async))
+        parameters.append(parameter)
+
+    async def async_endpoint(**kwargs):
+        db: AsyncSession = kwargs[db_parameter]
+
+        def call(session):
+            kwargs[db_parameter] = session
+            result = endpoint(**kwargs)
+            # Responses are sent as they are; streaming ones (NDJSON/CSV
+            # exports) read through a session of their own, not this one
+            if adapter is None or isinstance(result, Response):
+                return result
+            # Serialize while still inside the session's greenlet so lazy
+            # attribute loads keep working
+            return adapter.validate_python(result, from_attributes=True)
+
+        return await db.run_sync(call)
+
+    async_endpoint.__signature__ = signature.replace(parameters=parameters)
+    async_endpoint.__name__ = endpoint.__name__
+    async_endpoint.__doc__ = endpoint.__doc__
+    return async_endpoint
+
+def use_async_sessions(router: APIRouter) -> None:
+    """
+    Swap every eligible sync route of router for its async variant, in
+    place. Call it on sub-routers before they are included in the app.
+    """
+    async_router = APIRouter()
+    for index, route in enumerate(router.routes):
+        if not is_async_candidate(route):
+            continue
+
+        async_router.add_api_route(
+            route.path,
+            make_async_endpoint(route),
+            methods=list(route.methods),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            responses=route.responses,
+            name=route.name,
+            response_class=route.response_class,
+            include_in_schema=route.include_in_schema,
+        )
+        router.routes[index] = async_router.routes[-1]
@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Hashable, Optional
+from ..config import settings
+
+class TTLCache:
+    """
+    Thread-safe in-process LRU cache whose entries expire after a TTL.
+    Each worker process holds its own copy, so entries are only as fresh
+    as the TTL when writes land on another worker.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value; ``ttl`` overrides the default lifetime for this entry"""
+        if self.maxsize <= 0:
+            return
+
+        lifetime = self.ttl if ttl is None else min(self.ttl, ttl)
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + lifetime)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+def seconds_until_midnight() -> float:
+    """Seconds left in the current local day, for data that depends on date.today()"""
+    now = datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return (midnight - now).total_seconds()
+
+# Assembled DashboardResponse per user id
+dashboard_cache = TTLCache(
+    maxsize=settings.dashboard_cache_max_entries,
+    ttl=settings.dashboard_cache_ttl_seconds
+)
+
+# Detached, read-only User snapshots per user id for get_current_user
+user_cache = TTLCache(
+    maxsize=settings.user_cache_max_entries,
+    ttl=settings.user_cache_ttl_seconds
+)
+
+# (kid, key, verified JWT payload) per token digest; entries expire with
+# the token
+token_cache = TTLCache(
+    maxsize=settings.token_cache_max_entries,
+    ttl=settings.access_token_expire_minutes * 60
+)
+
+# Users whose access tokens get_current_identity refuses before they
+# expire, i.e. accounts deleted by this worker
+revoked_user_cache = TTLCache(
+    maxsize=settings.user_cache_max_entries,
+    ttl=settings.access_token_expire_minutes * 60
+)
+
+# GrowthAnalyticsResponse per (user id, child id)
+growth_analytics_cache = TTLCache(
+    maxsize=settings.growth_analytics_cache_max_entries,
+    ttl=settings.growth_analytics_cache_ttl_seconds
+)
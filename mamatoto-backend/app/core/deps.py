@@ -1,13 +1,19 @@
 # app/core/deps.py
-from typing import Generator
+import secrets
+from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from .security import verify_token
-from ..database import get_db
+from .security import decode_token, verify_token
+from .cache import revoked_user_cache, user_cache
+from ..config import settings
+from ..database import get_db, get_async_db
 from ..models.user import User
+from ..schemas.user import TokenData
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 def get_current_user(
     token: str = Depends(security),
@@ -23,8 +29,96 @@ def get_current_user(
     if user_id is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = user_cache.get(user_id)
     if user is None:
+        user = db.query(User).filter(
+            User.id == user_id,
+            User.deleted_at.is_(None)
+        ).first()
+        if user is None:
+            raise credentials_exception
+        cache_user_snapshot(db, user)
+    
+    return user
+
+async def get_current_user_async(
+    token: str = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    user_id = verify_token(token.credentials)
+    if user_id is None:
         raise credentials_exception
     
-    return user
\ No newline at end of file
+    user = user_cache.get(user_id)
+    if user is None:
+        user = await db.get(User, user_id)
+        if user is None or user.deleted_at is not None:
+            raise credentials_exception
+        cache_user_snapshot(db, user)
+    
+    return user
+
+def get_current_identity(token: str = Depends(security)) -> TokenData:
+    """
+    Identity from the access token's claims alone, without loading the user.
+    For read-only endpoints that only need the user id; claims can be up to
+    one access token lifetime out of date, e.g. after PUT /auth/me.
+
+    Tokens of an account deleted by this worker are refused at once through
+    revoked_user_cache. Other workers keep accepting them until they expire
+    (ACCESS_TOKEN_EXPIRE_MINUTES), since deletion revokes the refresh
+    tokens that would renew them.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    payload = decode_token(token.credentials)
+    try:
+        identity = TokenData(
+            id=payload["sub"],
+            preferred_language=payload.get("lang") or "en",
+            is_active=payload.get("active", True)
+        )
+    except (TypeError, KeyError, ValueError):
+        raise credentials_exception
+    
+    if not identity.is_active or revoked_user_cache.get(identity.id) is not None:
+        raise credentials_exception
+    return identity
+
+def cache_user_snapshot(db, user: User) -> None:
+    """
+    Detach the loaded user and cache it. The snapshot is shared between
+    requests, so endpoints must treat current_user as read-only and load
+    their own copy of the row before modifying it.
+    """
+    db.expunge(user)
+    user_cache.set(user.id, user)
+
+def require_metrics_token(
+    token: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> None:
+    """
+    Guard for operational endpoints: the bearer token must equal
+    settings.metrics_token. Without a configured token the endpoint does
+    not exist as far as clients can tell.
+    """
+    if not settings.metrics_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if token is None or not secrets.compare_digest(
+        token.credentials.encode(), settings.metrics_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
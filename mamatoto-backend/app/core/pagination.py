@@ -0,0 +1,167 @@
+"""
+Keyset (cursor) pagination of list endpoints.
+
+Lists are ordered by (sort key, id), and id makes the order total. A page
+that is not the last sets the X-Next-Cursor response header to an opaque
+cursor holding its last row's sort key and id. Passing it back as
+?cursor= returns the rows strictly after that row. The WHERE clause
+seeks straight to it through the (owner, sort key) index, so page N costs
+the same as page 1. Rows inserted or deleted meanwhile never make
+existing rows repeat or go missing across pages, as they would with
+OFFSET.
+
+The response body keeps its plain list shape; clients that need the
+whole collection follow the header until it is absent.
+
+Run ``python -m app.core.pagination --benchmark 100000`` to time pages at
+increasing depth of one user's N health records, by cursor and by OFFSET.
+"""
+import argparse
+import base64
+import binascii
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import List, NamedTuple, Optional
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query as OrmQuery
+from ..config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class PageParams(NamedTuple):
+    limit: int
+    cursor: Optional[str]
+
+def page_params(
+    limit: Optional[int] = Query(None, ge=1, le=settings.page_size_max),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page")
+) -> PageParams:
+    return PageParams(limit or settings.page_size_default, cursor)
+
+def encode_cursor(sort_value, row_id: int) -> str:
+    if isinstance(sort_value, (date, datetime)):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_column) -> tuple:
+    """The (sort key, id) a cursor points at, typed like sort_column"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(payload)
+        python_type = sort_column.type.python_type
+        if python_type in (date, datetime):
+            sort_value = python_type.fromisoformat(sort_value)
+        if not isinstance(row_id, int):
+            raise ValueError(row_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return sort_value, row_id
+
+def paginate(
+    query: OrmQuery, page: PageParams, response: Response,
+    sort_column, id_column, descending: bool = False
+) -> List:
+    """
+    One page of query ordered by (sort_column, id_column), setting the next
+    page's cursor on response. sort_column must not be NULL.
+    """
+    key = tuple_(sort_column, id_column)
+    if page.cursor is not None:
+        after = decode_cursor(page.cursor, sort_column)
+        query = query.filter(key < after if descending else key > after)
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column, id_column)
+
+    # One extra row tells whether another page follows
+    rows = query.limit(page.limit + 1).all()
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            getattr(last, sort_column.key), getattr(last, id_column.key)
+        )
+    return rows
+
+def main(argv=None):
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import sessionmaker
+    from ..database import Base
+    from ..models.health import HealthRecord
+    from ..models.user import User
+
+    parser = argparse.ArgumentParser(description="Keyset vs OFFSET pagination")
+    parser.add_argument("--benchmark", type=int, default=100_000, metavar="N",
+                        help="Health records of the paged user")
+    parser.add_argument("--limit", type=int, default=settings.page_size_default,
+                        help="Page size")
+    parser.add_argument("--repeat", type=int, default=20,
+                        help="Times each page is fetched; the median is reported")
+    args = parser.parse_args(argv)
+
+    # A throwaway database built from the models, indexes included
+    directory = tempfile.TemporaryDirectory(prefix="mamatoto-pagination-")
+    engine = create_engine(f"sqlite:///{os.path.join(directory.name, 'benchmark.db')}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+
+    db.execute(insert(User), [
+        {"id": user_id, "email": f"user{user_id}@example.com", "hashed_password": "-"}
+        for user_id in (1, 2)
+    ])
+    # N records for user 1 interleaved with as many of user 2
+    start = datetime(2020, 1, 1)
+    total = args.benchmark * 2
+    for first in range(0, total, 20_000):
+        db.execute(insert(HealthRecord), [
+            {"user_id": 1 + i % 2, "record_type": "general", "title": "Visit",
+             "recorded_date": start.date(), "created_at": start + timedelta(minutes=i)}
+            for i in range(first, min(first + 20_000, total))
+        ])
+    db.commit()
+
+    query = db.query(HealthRecord).filter(HealthRecord.user_id == 1)
+    ordered = query.order_by(HealthRecord.created_at.desc(), HealthRecord.id.desc())
+
+    def median_ms(fetch):
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            rows = fetch()
+            timings.append(time.perf_counter() - started)
+            db.expunge_all()
+        assert len(rows) == args.limit
+        return statistics.median(timings) * 1000
+
+    print(f"{args.benchmark} health records of one user, {args.limit} per page")
+    print(f"{'depth':>10} {'cursor ms':>10} {'offset ms':>10}")
+    depths = sorted({0, args.benchmark // 100, args.benchmark // 10,
+                     args.benchmark // 2, args.benchmark - args.limit})
+    for depth in depths:
+        cursor = None
+        if depth:
+            last = ordered.offset(depth - 1).first()
+            cursor = encode_cursor(last.created_at, last.id)
+        page = PageParams(args.limit, cursor)
+        keyset = median_ms(lambda: paginate(
+            query, page, Response(), HealthRecord.created_at, HealthRecord.id, descending=True
+        ))
+        offset = median_ms(lambda: ordered.offset(depth).limit(args.limit).all())
+        print(f"{depth:>10} {keyset:>10.3f} {offset:>10.3f}")
+
+    db.close()
+    engine.dispose()
+    directory.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# app/core/rate_limit.py
+"""
+Token-bucket rate limiting for the password endpoints.
+
+Every bucket holds up to ``burst`` tokens and refills at ``per_minute``
+tokens a minute; a request takes one token or is answered with 429 and a
+Retry-After header. The checks run as route dependencies, so a rejected
+login or registration never reaches bcrypt.
+
+Buckets live in memory, which makes limits per worker process. Set
+RATE_LIMIT_SQLITE_PATH to keep them in a small SQLite file shared by all
+workers on the host instead.
+"""
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+from ..config import settings
+from ..schemas.user import UserCreate
+
+# Shared-store rows untouched for this long are full again and can go
+IDLE_BUCKET_SECONDS = 3600
+PRUNE_EVERY = 100
+
+class MemoryBucketStore:
+    """Buckets for this process only; least recently used keys are dropped"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, burst: int, per_minute: float) -> float:
+        """Take a token; returns 0 if allowed, else seconds until one is available"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens, retry_after = _refill_and_take(tokens, now - updated, burst, per_minute)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+            return retry_after
+
+class SQLiteBucketStore:
+    """Buckets in a SQLite file, so every worker on the host shares them"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._takes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._local.connection = connection
+        return connection
+
+    def take(self, key: str, burst: int, per_minute: float) -> float:
+        # Wall clock, since the timestamps are compared across processes
+        now = time.time()
+        connection = self._connection()
+        # IMMEDIATE takes the write lock up front so concurrent workers
+        # serialize on the read-modify-write of a bucket
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated = row if row else (burst, now)
+            tokens, retry_after = _refill_and_take(tokens, now - updated, burst, per_minute)
+            connection.execute(
+                "INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now)
+            )
+            self._takes += 1
+            if self._takes % PRUNE_EVERY == 0:
+                connection.execute(
+                    "DELETE FROM rate_limit_buckets WHERE updated < ?",
+                    (now - IDLE_BUCKET_SECONDS,)
+                )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return retry_after
+
+def _refill_and_take(
+    tokens: float, elapsed: float, burst: int, per_minute: float
+) -> Tuple[float, float]:
+    tokens = min(burst, tokens + max(elapsed, 0) * per_minute / 60)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) * 60 / per_minute
+
+class RateLimiter:
+    def __init__(self):
+        self.store = (
+            SQLiteBucketStore(settings.rate_limit_sqlite_path)
+            if settings.rate_limit_sqlite_path
+            else MemoryBucketStore(settings.rate_limit_max_entries)
+        )
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected: Dict[str, int] = {}
+
+    def check(self, scope: str, key: str, burst: int, per_minute: float) -> None:
+        if not settings.rate_limit_enabled or not key:
+            return
+
+        retry_after = self.store.take(f"{scope}:{key}", burst, per_minute)
+        with self._lock:
+            if not retry_after:
+                self.allowed += 1
+                return
+            self.rejected[scope] = self.rejected.get(scope, 0) + 1
+
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, please try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": settings.rate_limit_enabled,
+                "store": "sqlite" if isinstance(self.store, SQLiteBucketStore) else "memory",
+                "allowed": self.allowed,
+                "rejected": dict(self.rejected),
+            }
+
+rate_limiter = RateLimiter()
+
+def _client_ip(request: Request) -> str:
+    # Run uvicorn/gunicorn with --proxy-headers behind a reverse proxy so
+    # this is the caller's address rather than the proxy's
+    return request.client.host if request.client else ""
+
+def _check_ip(request: Request) -> None:
+    rate_limiter.check(
+        "ip", _client_ip(request),
+        settings.rate_limit_ip_burst, settings.rate_limit_ip_per_minute
+    )
+
+def _check_email(email: str) -> None:
+    rate_limiter.check(
+        "email", email.strip().lower(),
+        settings.rate_limit_email_burst, settings.rate_limit_email_per_minute
+    )
+
+def limit_login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()) -> None:
+    _check_ip(request)
+    _check_email(form_data.username)
+
+def limit_register(request: Request, user: UserCreate) -> None:
+    _check_ip(request)
+    _check_email(user.email)
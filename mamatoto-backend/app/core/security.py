@@ -1,15 +1,39 @@
 # app/core/security.py
+"""
+Password hashing, access/refresh tokens and token verification.
+
+Run ``python -m app.core.security --benchmark 5000`` to time verifying
+access tokens signed with the current key and with several previous ones,
+uncached and from the token cache.
+"""
+import argparse
+import asyncio
+import hashlib
+import multiprocessing
+import secrets
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from typing import Any, Dict, Union, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from .cache import token_cache
 from ..config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes with fewer rounds than configured are reported as needing an update
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.bcrypt_rounds
+)
 
 def create_access_token(
-    subject: Union[str, Any], expires_delta: Optional[timedelta] = None
+    subject: Union[str, Any],
+    expires_delta: Optional[timedelta] = None,
+    claims: Optional[Dict[str, Any]] = None
 ) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -18,22 +42,223 @@ def create_access_token(
             minutes=settings.access_token_expire_minutes
         )
     
-    to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject)}
+    encoded_jwt = jwt.encode(
+        to_encode,
+        settings.secret_key,
+        algorithm=settings.algorithm,
+        headers={"kid": settings.jwt_key_id}
+    )
     return encoded_jwt
 
+def create_refresh_token() -> str:
+    """Opaque random refresh token; persist only hash_refresh_token(token)"""
+    return secrets.token_urlsafe(32)
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def _verification_keys() -> Dict[str, str]:
+    return {**settings.jwt_previous_keys, settings.jwt_key_id: settings.secret_key}
+
+def decode_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Verify a token and return its payload. Verified payloads are cached by
+    token digest until the token expires, so repeated requests with the same
+    token skip the signature check. A cached payload is only returned while
+    the key that verified it is still configured under its kid, so retiring
+    or replacing a key takes effect immediately.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    cached = token_cache.get(digest)
+    if cached is not None:
+        kid, key, payload = cached
+        if _verification_keys().get(kid) == key:
+            return payload
+        token_cache.invalidate(digest)
+
+    try:
+        # Tokens issued before key ids were introduced carry no kid
+        kid = jwt.get_unverified_header(token).get("kid", settings.jwt_key_id)
+        key = _verification_keys().get(kid)
+        if key is None:
+            return None
+        payload = jwt.decode(token, key, algorithms=[settings.algorithm])
+    except JWTError:
+        return None
+
+    exp = payload.get("exp")
+    if exp is not None:
+        token_cache.set(digest, (kid, key, payload), ttl=exp - time.time())
+    return payload
+
 def verify_token(token: str) -> Optional[int]:
+    payload = decode_token(token)
+    if payload is None:
+        return None
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         user_id: str = payload.get("sub")
         if user_id is None:
             return None
         return int(user_id)
-    except (JWTError, ValueError):
+    except ValueError:
         return None
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+class PasswordHashMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.operations = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.rejected = 0
+        self.rehashed = 0
+
+    def enter(self) -> None:
+        with self._lock:
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+    def leave(self, seconds: float) -> None:
+        with self._lock:
+            self.queue_depth -= 1
+            self.operations += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def reject(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def rehash(self) -> None:
+        with self._lock:
+            self.rehashed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": settings.password_hash_workers,
+                "max_queue": settings.password_hash_max_queue,
+                "bcrypt_rounds": settings.bcrypt_rounds,
+                "operations": self.operations,
+                "avg_latency_ms": round(self.total_seconds / self.operations * 1000, 2) if self.operations else None,
+                "max_latency_ms": round(self.max_seconds * 1000, 2),
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+            }
+
+password_hash_metrics = PasswordHashMetrics()
+
+# bcrypt is CPU bound; running it in a few dedicated processes keeps a burst
+# of logins from occupying the API's cores. Callers await the result on the
+# event loop, so waiting hashes hold no request threadpool thread. At most
+# workers + max_queue hashes are admitted, the rest get a 503.
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_pool_lock = threading.Lock()
+_hash_slots = threading.BoundedSemaphore(
+    max(settings.password_hash_workers, 1) + settings.password_hash_max_queue
+)
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            # Spawned, not forked: the pool starts lazily from a request
+            # thread, and a fork would copy the parent's held locks, open
+            # pool connections and scheduler threads into the workers
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=settings.password_hash_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _hash_pool
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(cancel_futures=True)
+            _hash_pool = None
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, hashed_password)
+
+async def _run_hashing(function, *args):
+    if not _hash_slots.acquire(blocking=False):
+        password_hash_metrics.reject()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in requests, please try again shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    password_hash_metrics.enter()
+    started = time.perf_counter()
+    try:
+        if settings.password_hash_workers <= 0:
+            return await run_in_threadpool(function, *args)
+        return await asyncio.wrap_future(_get_hash_pool().submit(function, *args))
+    finally:
+        password_hash_metrics.leave(time.perf_counter() - started)
+        _hash_slots.release()
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return (await verify_and_update_password(plain_password, hashed_password))[0]
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password; the second element is a replacement hash when the
+    stored one was made with outdated parameters (e.g. fewer bcrypt rounds)
+    """
+    verified, new_hash = await _run_hashing(_verify_and_update, plain_password, hashed_password)
+    if new_hash:
+        password_hash_metrics.rehash()
+    return verified, new_hash
+
+async def get_password_hash(password: str) -> str:
+    return await _run_hashing(_hash, password)
+
+def get_password_hash_metrics() -> Dict[str, Any]:
+    return password_hash_metrics.snapshot()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Access token verification benchmark")
+    parser.add_argument("--benchmark", type=int, default=5_000, metavar="N",
+                        help="Distinct tokens verified per run; keep below "
+                             "TOKEN_CACHE_MAX_ENTRIES so the cached pass hits")
+    parser.add_argument("--previous-keys", type=int, nargs="+", default=[0, 4, 16], metavar="K",
+                        help="Numbers of previous keys to sign tokens with, one run each")
+    args = parser.parse_args(argv)
+
+    current = (settings.jwt_key_id, settings.secret_key)
+    print(f"{'keys':>5} {'uncached/s':>12} {'cached/s':>12}")
+    for previous in args.previous_keys:
+        # Tokens are spread evenly over the current and K previous keys
+        keys = {f"previous-{i}": secrets.token_hex(32) for i in range(previous)}
+        settings.jwt_previous_keys = keys
+        signing = list(keys.items()) + [current]
+        expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
+        tokens = [
+            jwt.encode({"exp": expire, "sub": str(i)}, signing[i % len(signing)][1],
+                       algorithm=settings.algorithm, headers={"kid": signing[i % len(signing)][0]})
+            for i in range(args.benchmark)
+        ]
+
+        token_cache.clear()
+        rates = []
+        for _ in ("uncached", "cached"):
+            started = time.perf_counter()
+            for token in tokens:
+                assert decode_token(token) is not None
+            rates.append(len(tokens) / (time.perf_counter() - started))
+        print(f"{previous + 1:>5} {rates[0]:>12.0f} {rates[1]:>12.0f}")
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
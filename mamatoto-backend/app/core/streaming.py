@@ -0,0 +1,108 @@
+"""
+Streaming NDJSON and CSV exports of list endpoints.
+
+A list endpoint whose request asks for ``Accept: application/x-ndjson`` or
+``text/csv`` returns the whole collection as a StreamingResponse instead
+of a page. Rows are read as plain column tuples (no ORM objects, no
+identity map) through a server-side cursor, ``yield_per`` rows at a time.
+Each batch is validated with the endpoint's response schema, serialized
+and sent before the next one is fetched, so memory stays at one batch
+whatever the size of the collection.
+
+The stream outlives the endpoint and its request session, so it opens a
+session of its own. In the async mode that is an AsyncSession streaming
+over the async driver; otherwise a sync session iterated from the
+threadpool.
+"""
+import csv
+import io
+import json
+from typing import Callable, Dict, Iterable, Iterator, Optional, Type
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+from ..config import settings
+from ..database import SessionLocal, AsyncSessionLocal
+
+NDJSON = "application/x-ndjson"
+CSV = "text/csv"
+STREAMING_MEDIA_TYPES = (NDJSON, CSV)
+
+def streaming_media_type(request: Request) -> Optional[str]:
+    """The streaming format the Accept header asks for, if any"""
+    for part in request.headers.get("accept", "").split(","):
+        media_type, *parameters = [item.strip().lower() for item in part.split(";")]
+        if media_type in STREAMING_MEDIA_TYPES and "q=0" not in parameters:
+            return media_type
+    return None
+
+def _encoder(schema: Type[BaseModel], media_type: str,
+             prepare: Callable) -> Callable[[Iterable], str]:
+    """Serialize one batch of rows to a chunk of the response body"""
+    if media_type == NDJSON:
+        def encode(rows):
+            return "".join(
+                schema.model_validate(prepare(row)).model_dump_json() + "\n" for row in rows
+            )
+        return encode
+
+    fields = list(schema.model_fields)
+
+    def encode(rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            values = schema.model_validate(prepare(row)).model_dump(mode="json")
+            writer.writerow([
+                json.dumps(value) if isinstance(value, (dict, list)) else value
+                for value in (values[field] for field in fields)
+            ])
+        return buffer.getvalue()
+    return encode
+
+def _csv_header(schema: Type[BaseModel]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(list(schema.model_fields))
+    return buffer.getvalue()
+
+def stream_rows(
+    statement: Select, schema: Type[BaseModel], media_type: str, filename: str,
+    prepare: Optional[Callable[[object], Dict]] = None
+) -> StreamingResponse:
+    """
+    Stream the rows of statement, a select of plain columns, as NDJSON or
+    CSV. prepare turns a row into the schema's input (by default the row's
+    column mapping), e.g. to add fields computed at read time.
+    """
+    prepare = prepare or (lambda row: row._mapping)
+    encode = _encoder(schema, media_type, prepare)
+    header = _csv_header(schema) if media_type == CSV else ""
+    statement = statement.execution_options(yield_per=settings.stream_batch_size)
+
+    def sync_body() -> Iterator[str]:
+        db = SessionLocal()
+        try:
+            if header:
+                yield header
+            for batch in db.execute(statement).partitions():
+                yield encode(batch)
+        finally:
+            db.close()
+
+    async def async_body():
+        async with AsyncSessionLocal() as db:
+            if header:
+                yield header
+            result = await db.stream(statement)
+            async for batch in result.partitions():
+                yield encode(batch)
+
+    headers = {}
+    if media_type == CSV:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+    return StreamingResponse(
+        async_body() if settings.db_async else sync_body(),
+        media_type=media_type,
+        headers=headers
+    )
@@ -1,18 +1,134 @@
 # app/database.py
-from sqlalchemy import create_engine
+import os
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from .config import settings
 
+IS_SQLITE = "sqlite" in settings.database_url
+IS_SQLITE_MEMORY = IS_SQLITE and make_url(settings.database_url).database in (None, "", ":memory:")
+
+class PoolMetrics:
+    """Checkout wait times and timeouts observed by MeteredQueuePool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+pool_metrics = PoolMetrics()
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            pool_metrics.record(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record(time.perf_counter() - start)
+        return connection
+
+def _engine_options():
+    options = {}
+    if IS_SQLITE:
+        options["connect_args"] = {"check_same_thread": False}
+    if not IS_SQLITE_MEMORY:
+        # In-memory SQLite keeps its single-connection default pool
+        options.update(
+            poolclass=MeteredQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+        )
+    return options
+
 # Create engine
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
-)
+engine = create_engine(settings.database_url, **_engine_options())
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Concurrency/performance profile for every new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    if not IS_SQLITE_MEMORY:
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+    cursor.close()
+
+if IS_SQLITE:
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+
+def get_pool_metrics():
+    """Pool occupancy and checkout wait statistics for /metrics"""
+    pool = engine.pool
+    metrics = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        metrics.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            saturation=round(pool.checkedout() / capacity, 4) if capacity else None,
+            checkouts=pool_metrics.checkouts,
+            timeouts=pool_metrics.timeouts,
+            avg_wait_ms=round(pool_metrics.total_wait / pool_metrics.checkouts * 1000, 3)
+            if pool_metrics.checkouts else None,
+            max_wait_ms=round(pool_metrics.max_wait * 1000, 3),
+        )
+    return metrics
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def get_async_database_url() -> str:
+    """Async driver URL: aiosqlite for SQLite, asyncpg for PostgreSQL"""
+    if settings.async_database_url:
+        return settings.async_database_url
+
+    url = make_url(settings.database_url)
+    if url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    elif url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+# Async engine and sessions, only built when the async mode is selected
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.db_async:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_options = _engine_options()
+    async_options.pop("poolclass", None)  # async engines need their own pool class
+    async_engine = create_async_engine(get_async_database_url(), **async_options)
+    if IS_SQLITE:
+        event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+    AsyncSessionLocal = async_sessionmaker(async_engine, autocommit=False, autoflush=False)
+
 # Create Base class
 Base = declarative_base()
 
@@ -23,3 +139,32 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get an async DB session (settings.db_async)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+def check_schema_version():
+    """
+    Fail fast unless the database is at the latest Alembic revision.
+    Schema changes are applied separately with `alembic upgrade head`.
+    """
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    expected = set(ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_heads())
+    with engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+
+    if current != expected:
+        raise SchemaVersionError(
+            f"Database schema is at revision {sorted(current) or 'none'}, "
+            f"expected {sorted(expected)}; run `alembic upgrade head`"
+        )
@@ -0,0 +1,202 @@
+"""
+Purge the data of accounts that were deleted through DELETE /auth/me.
+
+Deleting an account only marks the user (users.deleted_at) and releases
+their email so the request returns immediately; the rows are then removed
+here with one set-based DELETE per table, children before parents,
+instead of loading every related object through the ORM cascades. The
+purge is queued right after the request, waiting briefly for a purge
+already in progress, and the in-process scheduler retries any account
+left behind, e.g. after a restart. It can also be run from the command line:
+
+    python -m app.jobs.account_purge [--user-id ID]
+"""
+import argparse
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import SessionLocal
+from ..models.user import User, RefreshToken
+from ..models.pregnancy import Pregnancy, Appointment
+from ..models.child import Child, Vaccination, GrowthRecord, Milestone
+from ..models.health import HealthRecord, MentalHealthAssessment, EmergencyContact
+from .lease import acquire_lease, release_lease, make_owner_id
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "account_purge"
+LEASE_POLL_SECONDS = 0.5  # between attempts to take a busy lease
+
+_owner = make_owner_id()
+_run_lock = threading.Lock()  # The lease is per process; this covers threads
+_metrics_lock = threading.Lock()
+_metrics = {
+    "runs": 0,
+    "skipped_runs": 0,
+    "accounts_purged": 0,
+    "rows_deleted": 0,
+    "last_run": None,
+}
+
+def purge_account(db: Session, user_id: int) -> int:
+    """
+    Delete a user and everything that references them in one transaction,
+    ordered by foreign key. Returns the number of rows deleted.
+    """
+    child_ids = select(Child.id).where(Child.user_id == user_id)
+    pregnancy_ids = select(Pregnancy.id).where(Pregnancy.user_id == user_id)
+
+    statements = [
+        delete(Vaccination).where(Vaccination.child_id.in_(child_ids)),
+        delete(GrowthRecord).where(GrowthRecord.child_id.in_(child_ids)),
+        delete(Milestone).where(Milestone.child_id.in_(child_ids)),
+        delete(HealthRecord).where(or_(
+            HealthRecord.user_id == user_id,
+            HealthRecord.child_id.in_(child_ids),
+            HealthRecord.pregnancy_id.in_(pregnancy_ids)
+        )),
+        delete(Appointment).where(or_(
+            Appointment.user_id == user_id,
+            Appointment.pregnancy_id.in_(pregnancy_ids)
+        )),
+        delete(Child).where(Child.user_id == user_id),
+        delete(Pregnancy).where(Pregnancy.user_id == user_id),
+        delete(MentalHealthAssessment).where(MentalHealthAssessment.user_id == user_id),
+        delete(EmergencyContact).where(EmergencyContact.user_id == user_id),
+        delete(RefreshToken).where(RefreshToken.user_id == user_id),
+        delete(User).where(User.id == user_id),
+    ]
+
+    rows_deleted = 0
+    try:
+        for statement in statements:
+            result = db.execute(statement.execution_options(synchronize_session=False))
+            rows_deleted += result.rowcount
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return rows_deleted
+
+def pending_account_ids(db: Session, user_ids: Optional[List[int]] = None) -> List[int]:
+    """Accounts marked as deleted, optionally restricted to user_ids"""
+    query = select(User.id).where(User.deleted_at.is_not(None))
+    if user_ids is not None:
+        query = query.where(User.id.in_(user_ids))
+    return db.scalars(query).all()
+
+def run_purge(user_ids: Optional[List[int]] = None, wait: float = 0) -> Dict:
+    """
+    Purge the accounts marked as deleted (only those in user_ids, if given)
+    if this process can take the lease, waiting up to wait seconds for a
+    run in progress here or elsewhere to finish; records metrics
+    """
+    started_at = datetime.utcnow()
+    start = time.perf_counter()
+    deadline = time.monotonic() + wait
+    if not (_run_lock.acquire(timeout=wait) if wait > 0 else _run_lock.acquire(blocking=False)):
+        return _skipped(started_at)
+
+    db = SessionLocal()
+    try:
+        while not acquire_lease(db, LEASE_NAME, _owner, settings.job_lease_seconds):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return _skipped(started_at)
+            time.sleep(min(LEASE_POLL_SECONDS, remaining))
+
+        try:
+            pending = pending_account_ids(db, user_ids)
+            user_ids = []
+            rows_deleted = 0
+            for user_id in pending:
+                # Keep the lease alive; stop if another process took over
+                # after it expired, leaving the rest to that process
+                if user_ids and not acquire_lease(db, LEASE_NAME, _owner, settings.job_lease_seconds):
+                    logger.warning("Account purge lost its lease after %s accounts; stopping",
+                                   len(user_ids))
+                    break
+                rows_deleted += purge_account(db, user_id)
+                user_ids.append(user_id)
+        finally:
+            release_lease(db, LEASE_NAME, _owner)
+    finally:
+        db.close()
+        _run_lock.release()
+
+    run = {
+        "started_at": started_at.isoformat(),
+        "skipped": False,
+        "accounts_purged": len(user_ids),
+        "rows_deleted": rows_deleted,
+        "duration_seconds": round(time.perf_counter() - start, 4),
+    }
+    with _metrics_lock:
+        _metrics["runs"] += 1
+        _metrics["accounts_purged"] += len(user_ids)
+        _metrics["rows_deleted"] += rows_deleted
+        _metrics["last_run"] = run
+    if user_ids:
+        logger.info("Purged %s accounts (%s rows) in %ss",
+                    len(user_ids), rows_deleted, run["duration_seconds"])
+    return run
+
+def purge_deleted_account(user_id: int) -> None:
+    """
+    Background task queued by DELETE /auth/me. A purge already running
+    here or in another process is waited for, up to
+    settings.account_purge_wait_seconds; past that the account is left to
+    the scheduler.
+    """
+    try:
+        run = run_purge([user_id], wait=settings.account_purge_wait_seconds)
+        if run["skipped"]:
+            logger.info("Account %s left to the scheduled purge; another purge was running",
+                        user_id)
+    except Exception:
+        # The scheduler picks the account up again on its next run
+        logger.exception("Purging account %s failed", user_id)
+
+def _skipped(started_at: datetime) -> Dict:
+    with _metrics_lock:
+        _metrics["skipped_runs"] += 1
+    return {"started_at": started_at.isoformat(), "skipped": True}
+
+def get_purge_metrics() -> Dict:
+    with _metrics_lock:
+        return dict(_metrics)
+
+def start_scheduler(interval_seconds: int) -> threading.Event:
+    """
+    Purge accounts marked as deleted every interval_seconds on a daemon
+    thread. Set the returned event to stop the loop.
+    """
+    stop = threading.Event()
+
+    def loop():
+        while not stop.is_set():
+            try:
+                run_purge()
+            except Exception:
+                logger.exception("Account purge failed")
+            stop.wait(interval_seconds)
+
+    threading.Thread(target=loop, name="account-purge", daemon=True).start()
+    return stop
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Purge deleted accounts")
+    parser.add_argument("--user-id", type=int, action="append", default=None,
+                        help="Only purge this deleted account (repeatable)")
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run_purge(args.user_id)))
+
+if __name__ == "__main__":
+    main()
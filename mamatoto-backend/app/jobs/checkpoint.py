@@ -0,0 +1,26 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from ..models.job import JobCheckpoint
+
+def load_checkpoint(db: Session, name: str) -> JobCheckpoint:
+    """The named checkpoint, created empty on a job's first run"""
+    checkpoint = db.get(JobCheckpoint, name)
+    if checkpoint is None:
+        checkpoint = JobCheckpoint(name=name, rows_done=0)
+        db.add(checkpoint)
+        db.commit()
+    return checkpoint
+
+def save_checkpoint(db: Session, checkpoint: JobCheckpoint, position: str, rows: int) -> None:
+    """
+    Move the checkpoint past a chunk of rows and commit it in the same
+    transaction as the chunk's writes, so a resumed run neither repeats
+    nor skips them
+    """
+    checkpoint.position = position
+    checkpoint.rows_done += rows
+    db.commit()
+
+def complete_checkpoint(db: Session, checkpoint: JobCheckpoint) -> None:
+    checkpoint.completed_at = datetime.utcnow()
+    db.commit()
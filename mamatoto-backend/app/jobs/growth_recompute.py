@@ -0,0 +1,259 @@
+"""
+Recompute the stored growth scores (BMI, WHO z-scores, percentiles and age)
+of every growth record, e.g. after the growth reference tables change.
+
+Records are read joined to their child in keyset-paginated chunks ordered
+by (child_id, id), scored with one vectorized call per chunk and written
+back with one executemany UPDATE per chunk. Each chunk commits together
+with the job's checkpoint, so a stopped run resumes after the last chunk
+it wrote and memory stays at one chunk whatever the table size. The API
+workers' cached growth analytics pick the new scores up once their
+entries expire (GROWTH_ANALYTICS_CACHE_TTL_SECONDS).
+
+Work can be split across processes by child_id range. Each range has its
+own checkpoint, named after the reference tables' version so a new
+reference starts over, and its own lease; a range whose process was
+killed is picked up again once that lease expires (JOB_LEASE_SECONDS).
+The ranges chosen by the first run of a reference are saved with its
+checkpoints and reused by every later run, so children added meanwhile
+never move the range bounds and a resume finds its checkpoints again:
+
+    python -m app.jobs.growth_recompute [--partitions N] [--chunk-size N]
+    python -m app.jobs.growth_recompute --child-id-start 1 --child-id-end 50000
+"""
+import argparse
+import json
+import logging
+import time
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import SessionLocal, engine
+from ..models.child import Child, GrowthRecord
+from ..models.job import JobCheckpoint
+from ..utils.growth import AVERAGE_DAYS_PER_MONTH, score_growth_measurements
+from ..utils.growth_standards import get_growth_standards
+from .checkpoint import complete_checkpoint, load_checkpoint, save_checkpoint
+from .lease import acquire_lease, release_lease, make_owner_id
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 2000
+
+def checkpoint_name(start: int, end: Optional[int]) -> str:
+    version = get_growth_standards().version
+    return f"growth_recompute:{version}:{start}-{'' if end is None else end}"
+
+def ranges_checkpoint_name() -> str:
+    return f"growth_recompute:{get_growth_standards().version}:ranges"
+
+def _fetch_chunk(
+    db: Session, start: int, end: Optional[int], after: Optional[Tuple[int, int]], limit: int
+) -> List[Tuple]:
+    query = select(
+        GrowthRecord.id, GrowthRecord.child_id, GrowthRecord.recorded_date,
+        GrowthRecord.weight, GrowthRecord.height, GrowthRecord.head_circumference,
+        Child.birth_date, Child.gender
+    ).join(Child, Child.id == GrowthRecord.child_id).where(GrowthRecord.child_id >= start)
+    if end is not None:
+        query = query.where(GrowthRecord.child_id < end)
+    if after is not None:
+        last_child_id, last_id = after
+        query = query.where(or_(
+            GrowthRecord.child_id > last_child_id,
+            and_(GrowthRecord.child_id == last_child_id, GrowthRecord.id > last_id)
+        ))
+    query = query.order_by(GrowthRecord.child_id, GrowthRecord.id).limit(limit)
+    return db.execute(query).all()
+
+def _score_chunk(rows: List[Tuple]) -> List[Dict]:
+    """UPDATE parameters for one chunk, scored with a single vectorized call"""
+    ids, _, recorded, weights, heights, head_circumferences, births, genders = zip(*rows)
+    age_days = (
+        np.array(recorded, dtype="datetime64[D]") - np.array(births, dtype="datetime64[D]")
+    ).astype(np.int64)
+    columns = score_growth_measurements(
+        [gender.value if gender else None for gender in genders],
+        age_days, weights, heights, head_circumferences
+    )
+    columns["age_days"] = age_days
+    columns["age_months"] = (age_days // AVERAGE_DAYS_PER_MONTH).astype(np.int64)
+
+    names = list(columns)
+    values = [columns[name].tolist() for name in names]
+    return [
+        dict(
+            {name: None if value != value else value for name, value in zip(names, row)},  # NaN -> NULL
+            id=record_id
+        )
+        for record_id, *row in zip(ids, *values)
+    ]
+
+def recompute_range(
+    start: int = 0, end: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict:
+    """
+    Recompute every growth record with start <= child_id < end, resuming
+    from the range's checkpoint. Returns a summary of the run.
+    """
+    started = time.perf_counter()
+    name = checkpoint_name(start, end)
+    owner = make_owner_id()
+    db = SessionLocal()
+    try:
+        # One process per range at a time
+        if not acquire_lease(db, name, owner, settings.job_lease_seconds):
+            return {"checkpoint": name, "skipped": True}
+
+        try:
+            checkpoint = load_checkpoint(db, name)
+            if checkpoint.completed_at is not None:
+                return {"checkpoint": name, "skipped": False, "rows_updated": 0,
+                        "rows_done": checkpoint.rows_done, "completed": True}
+
+            after = None
+            if checkpoint.position:
+                after = tuple(int(part) for part in checkpoint.position.split(":"))
+
+            rows_updated = 0
+            completed = True
+            while True:
+                rows = _fetch_chunk(db, start, end, after, chunk_size)
+                if not rows:
+                    break
+
+                # Renew the lease before writing; if it expired, another
+                # process may have taken the range over from the checkpoint
+                if not acquire_lease(db, name, owner, settings.job_lease_seconds):
+                    logger.warning("Growth recompute %s lost its lease; stopping", name)
+                    completed = False
+                    break
+
+                db.execute(update(GrowthRecord), _score_chunk(rows))
+                after = (rows[-1].child_id, rows[-1].id)
+                save_checkpoint(db, checkpoint, f"{after[0]}:{after[1]}", len(rows))
+                rows_updated += len(rows)
+
+            if completed:
+                complete_checkpoint(db, checkpoint)
+            rows_done = checkpoint.rows_done
+        finally:
+            release_lease(db, name, owner)
+    finally:
+        db.close()
+
+    summary = {
+        "checkpoint": name,
+        "skipped": False,
+        "rows_updated": rows_updated,
+        "rows_done": rows_done,
+        "completed": completed,
+        "duration_seconds": round(time.perf_counter() - started, 4),
+    }
+    logger.info("Growth recompute %s updated %s rows in %ss",
+                name, rows_updated, summary["duration_seconds"])
+    return summary
+
+def partition_child_ids(db: Session, partitions: int) -> List[Tuple[int, Optional[int]]]:
+    """
+    Split the child ids that have growth records into equal-width ranges;
+    the first starts at 0 and the last is open-ended
+    """
+    low, high = db.execute(
+        select(func.min(GrowthRecord.child_id), func.max(GrowthRecord.child_id))
+    ).one()
+    if low is None:
+        return []
+    if partitions == 1:
+        return [(0, None)]
+    width = max((high - low + 1) // partitions, 1)
+    bounds = [0] + list(range(low, high + 1, width))[1:partitions]
+    return [
+        (bound, bounds[index + 1] if index + 1 < len(bounds) else None)
+        for index, bound in enumerate(bounds)
+    ]
+
+def plan_child_id_ranges(db: Session, partitions: int) -> List[Tuple[int, Optional[int]]]:
+    """
+    The child id ranges of the current reference's run: those saved by the
+    run that started it, or a new split of partitions ranges, saved for the
+    runs that resume it
+    """
+    name = ranges_checkpoint_name()
+    saved = db.get(JobCheckpoint, name)
+    if saved is None:
+        ranges = partition_child_ids(db, partitions)
+        if not ranges:
+            return []
+        try:
+            db.add(JobCheckpoint(name=name, position=json.dumps(ranges), rows_done=0))
+            db.commit()
+            return ranges
+        except IntegrityError:
+            # Another run saved its ranges first; share them
+            db.rollback()
+            saved = db.get(JobCheckpoint, name)
+
+    ranges = [(start, end) for start, end in json.loads(saved.position)]
+    if len(ranges) != partitions:
+        logger.info("Growth recompute resumes with the %s ranges of its first run", len(ranges))
+    return ranges
+
+def reset_checkpoints(db: Session) -> int:
+    """
+    Forget the progress and ranges of the current reference so the next run
+    starts over
+    """
+    prefix = f"growth_recompute:{get_growth_standards().version}:"
+    deleted = db.query(JobCheckpoint).filter(
+        JobCheckpoint.name.startswith(prefix)
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+def _recompute_partition(args) -> Dict:
+    return recompute_range(*args)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute stored growth scores")
+    parser.add_argument("--partitions", type=int, default=1,
+                        help="Split child ids into N ranges processed in parallel "
+                             "(a resumed run keeps the ranges it started with)")
+    parser.add_argument("--child-id-start", type=int, default=None,
+                        help="Only process child ids >= this (one range, no partitioning)")
+    parser.add_argument("--child-id-end", type=int, default=None,
+                        help="Only process child ids < this")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Records read, scored and written per transaction")
+    parser.add_argument("--restart", action="store_true",
+                        help="Discard checkpoints and ranges of the current reference first")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        if args.restart:
+            reset_checkpoints(db)
+        if args.child_id_start is not None or args.child_id_end is not None:
+            ranges = [(args.child_id_start or 0, args.child_id_end)]
+        else:
+            ranges = plan_child_id_ranges(db, max(args.partitions, 1))
+    finally:
+        db.close()
+    # Worker processes must open their own connections, not inherit ours
+    engine.dispose()
+
+    work = [(start, end, args.chunk_size) for start, end in ranges]
+    if len(work) > 1:
+        with Pool(len(work)) as pool:
+            results = pool.map(_recompute_partition, work)
+    else:
+        results = [_recompute_partition(item) for item in work]
+
+    print(json.dumps(results))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import update, delete, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..models.job import JobLease
+
+def make_owner_id() -> str:
+    """Identify this process as a lease holder"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+def acquire_lease(db: Session, name: str, owner: str, seconds: int) -> bool:
+    """
+    Take or renew the named lease. Succeeds when the lease is free, expired
+    or already held by owner; the conditional UPDATE and the primary key on
+    INSERT make this safe across processes sharing the database.
+    """
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=seconds)
+    
+    result = db.execute(
+        update(JobLease).where(
+            JobLease.name == name,
+            or_(JobLease.expires_at < now, JobLease.owner == owner)
+        ).values(owner=owner, expires_at=expires_at, updated_at=now)
+    )
+    db.commit()
+    if result.rowcount:
+        return True
+    
+    try:
+        db.add(JobLease(name=name, owner=owner, expires_at=expires_at))
+        db.commit()
+        return True
+    except IntegrityError:
+        # Someone else holds an unexpired lease
+        db.rollback()
+        return False
+
+def release_lease(db: Session, name: str, owner: str) -> None:
+    db.execute(
+        delete(JobLease).where(JobLease.name == name, JobLease.owner == owner)
+    )
+    db.commit()
@@ -0,0 +1,105 @@
+"""
+Bring every child's milestone rows up to the configured catalog version.
+
+New children get their milestones when they are created. This job is for
+existing children and catalog upgrades: for each catalog milestone, one
+INSERT ... SELECT adds it to every child that lacks it, and one UPDATE
+refreshes the text and typical age of rows seeded from an older version.
+Progress (achieved dates, notes) is never touched.
+
+    python -m app.jobs.milestone_seed
+"""
+import argparse
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Dict
+from sqlalchemy import and_, exists, false, insert, literal, select, update
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import SessionLocal
+from ..models.child import Child, Milestone
+from ..utils.milestones import MilestoneCatalog, get_milestone_catalog
+from .lease import acquire_lease, release_lease, make_owner_id
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "milestone_seed"
+
+SEEDED_COLUMNS = [
+    "child_id", "catalog_code", "catalog_version", "milestone_type",
+    "milestone_name", "typical_age_months", "is_achieved", "created_at",
+]
+
+def seed_milestones(db: Session, catalog: MilestoneCatalog) -> Dict[str, int]:
+    """Add missing catalog milestones and upgrade older ones, in one transaction"""
+    now = datetime.utcnow()
+    inserted = updated = 0
+    try:
+        for definition in catalog.definitions:
+            typical_age = round(definition.typical_age_months)
+            missing = ~exists().where(and_(
+                Milestone.child_id == Child.id,
+                Milestone.catalog_code == definition.code
+            ))
+            result = db.execute(insert(Milestone).from_select(
+                SEEDED_COLUMNS,
+                select(
+                    Child.id, literal(definition.code), literal(catalog.version),
+                    literal(definition.milestone_type), literal(definition.milestone_name),
+                    literal(typical_age), false(), literal(now)
+                ).where(missing)
+            ))
+            inserted += result.rowcount
+
+            result = db.execute(
+                update(Milestone).where(
+                    Milestone.catalog_code == definition.code,
+                    Milestone.catalog_version != catalog.version
+                ).values(
+                    catalog_version=catalog.version,
+                    milestone_type=definition.milestone_type,
+                    milestone_name=definition.milestone_name,
+                    typical_age_months=typical_age
+                ).execution_options(synchronize_session=False)
+            )
+            updated += result.rowcount
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {"rows_inserted": inserted, "rows_updated": updated}
+
+def run_seed() -> Dict:
+    start = time.perf_counter()
+    catalog = get_milestone_catalog()
+    owner = make_owner_id()
+    db = SessionLocal()
+    try:
+        if not acquire_lease(db, LEASE_NAME, owner, settings.job_lease_seconds):
+            return {"catalog_version": catalog.version, "skipped": True}
+        try:
+            counts = seed_milestones(db, catalog)
+        finally:
+            release_lease(db, LEASE_NAME, owner)
+    finally:
+        db.close()
+
+    run = dict(
+        counts,
+        catalog_version=catalog.version,
+        skipped=False,
+        duration_seconds=round(time.perf_counter() - start, 4)
+    )
+    logger.info("Seeded milestone catalog %s: %s rows inserted, %s updated in %ss",
+                catalog.version, run["rows_inserted"], run["rows_updated"], run["duration_seconds"])
+    return run
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed milestones from the catalog")
+    parser.parse_args(argv)
+    print(json.dumps(run_seed()))
+
+if __name__ == "__main__":
+    main()
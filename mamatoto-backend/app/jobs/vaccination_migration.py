@@ -0,0 +1,209 @@
+"""
+Move existing children to another vaccination schedule.
+
+Children are read in keyset-paginated chunks ordered by id, and the target
+schedule's dates are computed for a whole chunk at once. For each child:
+
+- doses still to give are re-dated and renamed from the target schedule
+- doses the target schedule does not have are deleted if still to give
+- doses the target schedule adds are inserted
+- administered and skipped doses keep their dates, only their schedule
+  changes
+
+Doses added by hand (without a schedule) are left alone. Each chunk
+commits with the job's checkpoint, named after the target schedule, so a
+stopped run resumes after the last child it migrated. Moving back to a
+schedule migrated to before needs --restart:
+
+    python -m app.jobs.vaccination_migration --to ke-kepi-v2 [--chunk-size N] [--restart]
+"""
+import argparse
+import json
+import logging
+import time
+from datetime import date
+from typing import Dict, List, Tuple
+import numpy as np
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import SessionLocal
+from ..models.child import Child, Vaccination
+from ..models.job import JobCheckpoint
+from ..utils.vaccination import build_vaccination_rows
+from ..utils.vaccination_schedule import VaccinationSchedule, get_schedule
+from .checkpoint import complete_checkpoint, load_checkpoint, save_checkpoint
+from .lease import acquire_lease, release_lease, make_owner_id
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+def checkpoint_name(schedule_id: str) -> str:
+    return f"vaccination_migration:{schedule_id}"
+
+def _fetch_children(db: Session, after: int, limit: int) -> List[Tuple]:
+    return db.execute(
+        select(Child.id, Child.birth_date).where(Child.id > after).order_by(Child.id).limit(limit)
+    ).all()
+
+def migrate_chunk(db: Session, schedule: VaccinationSchedule, children: List[Tuple]) -> Dict[str, int]:
+    """Bring one chunk of children to the schedule; the caller commits"""
+    child_ids = [child.id for child in children]
+    vaccinations = db.execute(
+        select(
+            Vaccination.id, Vaccination.child_id, Vaccination.vaccine_code,
+            Vaccination.vaccine_name, Vaccination.scheduled_date, Vaccination.status,
+            Vaccination.administered_date, Vaccination.schedule_id
+        ).where(Vaccination.child_id.in_(child_ids))
+    ).all()
+
+    scheduled = schedule.scheduled_dates(
+        np.array([child.birth_date.toordinal() for child in children], dtype=np.int64)
+    ).tolist()
+    rows = {child_id: row for row, child_id in enumerate(child_ids)}
+
+    present = set()
+    deleted, redated, reassigned = [], [], []
+    for vaccination in vaccinations:
+        present.add((vaccination.child_id, vaccination.vaccine_code))
+        if vaccination.schedule_id is None:
+            continue
+        position = schedule.index.get(vaccination.vaccine_code)
+        to_give = vaccination.administered_date is None and vaccination.status != "skipped"
+        if position is None:
+            if to_give:
+                deleted.append(vaccination.id)
+            elif vaccination.schedule_id != schedule.schedule_id:
+                reassigned.append({"id": vaccination.id, "schedule_id": schedule.schedule_id})
+        elif to_give:
+            dose = schedule.doses[position]
+            scheduled_date = date.fromordinal(scheduled[rows[vaccination.child_id]][position])
+            if (vaccination.scheduled_date, vaccination.vaccine_name, vaccination.schedule_id) != (
+                scheduled_date, dose.name, schedule.schedule_id
+            ):
+                # The sweeper re-marks it overdue if the new date has passed too
+                redated.append({
+                    "id": vaccination.id,
+                    "scheduled_date": scheduled_date,
+                    "vaccine_name": dose.name,
+                    "schedule_id": schedule.schedule_id,
+                    "status": "pending",
+                })
+        elif vaccination.schedule_id != schedule.schedule_id:
+            reassigned.append({"id": vaccination.id, "schedule_id": schedule.schedule_id})
+
+    missing = [
+        row
+        for row in build_vaccination_rows(child_ids, [child.birth_date for child in children], schedule)
+        if (row["child_id"], row["vaccine_code"]) not in present
+    ]
+
+    if deleted:
+        db.execute(delete(Vaccination).where(Vaccination.id.in_(deleted)))
+    if redated:
+        db.execute(update(Vaccination), redated)
+    if reassigned:
+        db.execute(update(Vaccination), reassigned)
+    if missing:
+        db.execute(insert(Vaccination), missing)
+    return {
+        "rows_inserted": len(missing),
+        "rows_updated": len(redated) + len(reassigned),
+        "rows_deleted": len(deleted),
+    }
+
+def reset_checkpoint(db: Session, schedule_id: str) -> int:
+    """Forget the progress of a migration so the next run starts over"""
+    deleted = db.query(JobCheckpoint).filter(
+        JobCheckpoint.name == checkpoint_name(schedule_id)
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+def run_migration(schedule_id: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+    """
+    Migrate every child to the schedule, resuming from its checkpoint.
+    Returns a summary of the run.
+    """
+    started = time.perf_counter()
+    schedule = get_schedule(schedule_id)
+    name = checkpoint_name(schedule_id)
+    owner = make_owner_id()
+    counts = {"rows_inserted": 0, "rows_updated": 0, "rows_deleted": 0}
+    db = SessionLocal()
+    try:
+        if not acquire_lease(db, name, owner, settings.job_lease_seconds):
+            return {"checkpoint": name, "skipped": True}
+
+        try:
+            checkpoint = load_checkpoint(db, name)
+            if checkpoint.completed_at is not None:
+                return dict(counts, checkpoint=name, skipped=False,
+                            children_done=checkpoint.rows_done, completed=True)
+
+            after = int(checkpoint.position or 0)
+            completed = True
+            while True:
+                children = _fetch_children(db, after, chunk_size)
+                if not children:
+                    break
+
+                # Renew the lease before writing; if it expired, another
+                # process may have taken the migration over from the checkpoint
+                if not acquire_lease(db, name, owner, settings.job_lease_seconds):
+                    logger.warning("Vaccination schedule migration to %s lost its lease; stopping",
+                                   schedule_id)
+                    completed = False
+                    break
+
+                try:
+                    for key, value in migrate_chunk(db, schedule, children).items():
+                        counts[key] += value
+                    after = children[-1].id
+                    save_checkpoint(db, checkpoint, str(after), len(children))
+                except Exception:
+                    db.rollback()
+                    raise
+
+            if completed:
+                complete_checkpoint(db, checkpoint)
+            children_done = checkpoint.rows_done
+        finally:
+            release_lease(db, name, owner)
+    finally:
+        db.close()
+
+    summary = dict(
+        counts,
+        checkpoint=name,
+        skipped=False,
+        children_done=children_done,
+        completed=completed,
+        duration_seconds=round(time.perf_counter() - started, 4)
+    )
+    logger.info("Vaccination schedule migration to %s: %s inserted, %s updated, %s deleted in %ss",
+                schedule_id, counts["rows_inserted"], counts["rows_updated"],
+                counts["rows_deleted"], summary["duration_seconds"])
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move children to another vaccination schedule")
+    parser.add_argument("--to", dest="schedule_id", default=settings.vaccination_schedule,
+                        help="Target schedule id (app/data/vaccination/<id>.csv)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Children migrated per transaction")
+    parser.add_argument("--restart", action="store_true",
+                        help="Discard the checkpoint of an earlier migration to this schedule first")
+    args = parser.parse_args(argv)
+
+    if args.restart:
+        db = SessionLocal()
+        try:
+            reset_checkpoint(db, args.schedule_id)
+        finally:
+            db.close()
+    print(json.dumps(run_migration(args.schedule_id, args.chunk_size)))
+
+if __name__ == "__main__":
+    main()
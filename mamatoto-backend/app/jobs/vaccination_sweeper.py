@@ -0,0 +1,147 @@
+"""
+Flip pending vaccinations that are past their grace window to "overdue".
+
+Runs in-process on a schedule (see start_scheduler) or from the command line:
+
+    python -m app.jobs.vaccination_sweeper [--date YYYY-MM-DD] [--batch-size N]
+"""
+import argparse
+import json
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..database import SessionLocal
+from ..models.child import Vaccination
+from ..utils.vaccination import OVERDUE_GRACE_DAYS
+from .lease import acquire_lease, release_lease, make_owner_id
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "vaccination_sweeper"
+
+_owner = make_owner_id()
+_run_lock = threading.Lock()  # The lease is per process; this covers threads
+_metrics_lock = threading.Lock()
+_metrics = {
+    "runs": 0,
+    "skipped_runs": 0,
+    "total_rows_updated": 0,
+    "last_run": None,
+}
+
+def sweep_overdue_vaccinations(
+    db: Session, today: Optional[date] = None, batch_size: Optional[int] = None
+) -> int:
+    """
+    Mark pending, unadministered doses scheduled before the cutoff as overdue
+    with set-based UPDATEs of at most batch_size rows, committing each batch
+    so no transaction holds locks for long. The lease is renewed before each
+    further batch and the sweep stops if it was lost. Returns the number of
+    rows updated.
+    """
+    today = today or date.today()
+    batch_size = batch_size or settings.vaccination_sweep_batch_size
+    cutoff = today - timedelta(days=OVERDUE_GRACE_DAYS)
+    
+    rows_updated = 0
+    while True:
+        if rows_updated and not acquire_lease(db, LEASE_NAME, _owner, settings.job_lease_seconds):
+            # Another process took over after our lease expired; it sweeps the rest
+            logger.warning("Vaccination sweep lost its lease after %s rows; stopping", rows_updated)
+            return rows_updated
+        
+        batch = select(Vaccination.id).where(
+            Vaccination.status == "pending",
+            Vaccination.administered_date.is_(None),
+            Vaccination.scheduled_date < cutoff
+        ).limit(batch_size).scalar_subquery()
+        
+        result = db.execute(
+            update(Vaccination).where(Vaccination.id.in_(batch))
+            .values(status="overdue")
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        rows_updated += result.rowcount
+        
+        if result.rowcount < batch_size:
+            return rows_updated
+
+def run_sweep(today: Optional[date] = None, batch_size: Optional[int] = None) -> Dict:
+    """Run one sweep if this process can take the lease, recording metrics"""
+    started_at = datetime.utcnow()
+    start = time.perf_counter()
+    if not _run_lock.acquire(blocking=False):
+        return _skipped(started_at)
+    
+    db = SessionLocal()
+    try:
+        if not acquire_lease(db, LEASE_NAME, _owner, settings.job_lease_seconds):
+            return _skipped(started_at)
+        
+        try:
+            rows_updated = sweep_overdue_vaccinations(db, today, batch_size)
+        finally:
+            release_lease(db, LEASE_NAME, _owner)
+    finally:
+        db.close()
+        _run_lock.release()
+    
+    run = {
+        "started_at": started_at.isoformat(),
+        "skipped": False,
+        "rows_updated": rows_updated,
+        "duration_seconds": round(time.perf_counter() - start, 4),
+    }
+    with _metrics_lock:
+        _metrics["runs"] += 1
+        _metrics["total_rows_updated"] += rows_updated
+        _metrics["last_run"] = run
+    logger.info("Vaccination sweep updated %s rows in %ss", rows_updated, run["duration_seconds"])
+    return run
+
+def _skipped(started_at: datetime) -> Dict:
+    with _metrics_lock:
+        _metrics["skipped_runs"] += 1
+    return {"started_at": started_at.isoformat(), "skipped": True}
+
+def get_sweeper_metrics() -> Dict:
+    with _metrics_lock:
+        return dict(_metrics)
+
+def start_scheduler(interval_seconds: int) -> threading.Event:
+    """
+    Sweep every interval_seconds on a daemon thread. Every worker may start
+    one; the lease ensures only one of them sweeps at a time. Set the
+    returned event to stop the loop.
+    """
+    stop = threading.Event()
+    
+    def loop():
+        while not stop.is_set():
+            try:
+                run_sweep()
+            except Exception:
+                logger.exception("Vaccination sweep failed")
+            stop.wait(interval_seconds)
+    
+    threading.Thread(target=loop, name="vaccination-sweeper", daemon=True).start()
+    return stop
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mark overdue vaccinations")
+    parser.add_argument("--date", type=date.fromisoformat, default=None,
+                        help="Reference date (defaults to today)")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="Rows updated per transaction")
+    args = parser.parse_args(argv)
+    
+    print(json.dumps(run_sweep(args.date, args.batch_size)))
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,32 @@ from sqlalchemy.orm import Session
 from datetime import date, timedelta
 
 from .config import settings
-from .database import engine, Base, get_db
-from .core.deps import get_current_user
+from .database import get_db, check_schema_version, get_pool_metrics
+from .core.deps import get_current_user, require_metrics_token
+from .core.pagination import NEXT_CURSOR_HEADER
+from .core.cache import (
+    dashboard_cache, user_cache, token_cache, growth_analytics_cache, seconds_until_midnight
+)
+from .core.async_routes import use_async_sessions
+from .core.security import get_password_hash_metrics, shutdown_hash_pool
+from .core.rate_limit import rate_limiter
 from .models.user import User
+from .models.pregnancy import Pregnancy, Appointment
+from .models.child import Child, Vaccination
+from .models.health import HealthRecord
+from .schemas.child import VaccinationResponse
 from .schemas.health import DashboardResponse
+from .utils.vaccination import OVERDUE_GRACE_DAYS
+from .utils.growth_reference import get_reference_curves
+from .jobs.vaccination_sweeper import start_scheduler, get_sweeper_metrics
+from .jobs import account_purge
 
 # Import API routers
 from .api.auth import router as auth_router
 from .api.pregnancy import router as pregnancy_router
-from .api.child import router as child_router
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+from .api.child import router as child_router, get_growth_analytics
+from .api.health import router as health_router
+from .api.growth import router as growth_router
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -32,12 +46,51 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Serve database-backed routes through AsyncSession when configured
+if settings.db_async:
+    for router in (pregnancy_router, child_router, health_router):
+        use_async_sessions(router)
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(pregnancy_router)
 app.include_router(child_router)
+app.include_router(health_router)
+app.include_router(growth_router)
+
+@app.on_event("startup")
+def verify_schema():
+    # Migrations are applied out of band with `alembic upgrade head`
+    if settings.check_schema_on_startup:
+        check_schema_version()
+
+@app.on_event("startup")
+def load_growth_standards():
+    # Parse the WHO tables and build the reference curves once instead of
+    # on the first request that needs them
+    get_reference_curves()
+
+@app.on_event("startup")
+def start_background_jobs():
+    if settings.vaccination_sweep_interval_seconds > 0:
+        app.state.stop_vaccination_sweeper = start_scheduler(
+            settings.vaccination_sweep_interval_seconds
+        )
+    if settings.account_purge_interval_seconds > 0:
+        app.state.stop_account_purge = account_purge.start_scheduler(
+            settings.account_purge_interval_seconds
+        )
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    for name in ("stop_vaccination_sweeper", "stop_account_purge"):
+        stop = getattr(app.state, name, None)
+        if stop:
+            stop.set()
+    shutdown_hash_pool()
 
 @app.get("/")
 def read_root():
@@ -51,15 +104,41 @@ def read_root():
 def health_check():
     return {"status": "healthy", "timestamp": date.today().isoformat()}
 
+@app.get("/metrics", dependencies=[Depends(require_metrics_token)], include_in_schema=False)
+def get_metrics():
+    """
+    In-process counters used to size caches and pools. Requires
+    Authorization: Bearer <METRICS_TOKEN>; 404 when no token is set.
+    """
+    return {
+        "db_pool": get_pool_metrics(),
+        "dashboard_cache": dashboard_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "growth_analytics_cache": growth_analytics_cache.stats(),
+        "password_hashing": get_password_hash_metrics(),
+        "auth_rate_limit": rate_limiter.stats(),
+        "vaccination_sweeper": get_sweeper_metrics(),
+        "account_purge": account_purge.get_purge_metrics()
+    }
+
 @app.get("/dashboard", response_model=DashboardResponse)
 def get_dashboard_data(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get comprehensive dashboard data for the user"""
-    from .models.pregnancy import Pregnancy, Appointment
-    from .models.child import Child, Vaccination
-    from .models.health import HealthRecord
+    """Get comprehensive dashboard data for the user
+
+    Issues a fixed number of queries regardless of how many children the
+    user has: per-child lookups are folded into single set-based queries.
+    The assembled response is cached per user until one of their writes
+    invalidates it, the TTL runs out or the day changes.
+    """
+    cached = dashboard_cache.get(current_user.id)
+    if cached is not None:
+        return cached
+    
+    today = date.today()
     
     # Get active pregnancy
     active_pregnancy = db.query(Pregnancy).filter(
@@ -69,7 +148,7 @@ def get_dashboard_data(
     
     # Add calculated fields to pregnancy
     if active_pregnancy:
-        days_remaining = (active_pregnancy.due_date - date.today()).days
+        days_remaining = (active_pregnancy.due_date - today).days
         active_pregnancy.weeks_remaining = max(0, days_remaining // 7)
         active_pregnancy.trimester = min(3, max(1, (active_pregnancy.current_week or 0) // 13 + 1))
     
@@ -81,58 +160,49 @@ def get_dashboard_data(
     
     # Add age to children
     for child in children:
-        age_days = (date.today() - child.birth_date).days
+        age_days = (today - child.birth_date).days
         child.age_months = age_days // 30
     
     # Get upcoming appointments
     upcoming_appointments = db.query(Appointment).filter(
         Appointment.user_id == current_user.id,
-        Appointment.scheduled_date >= date.today(),
+        Appointment.scheduled_date >= today,
         Appointment.completed == False
     ).order_by(Appointment.scheduled_date).limit(5).all()
     
-    # Get overdue vaccinations
-    overdue_vaccinations = []
-    for child in children:
-        overdue_date = date.today() - timedelta(days=30)
-        child_overdue = db.query(Vaccination).filter(
-            Vaccination.child_id == child.id,
+    # Get overdue vaccinations for all active children in one query. The
+    # overdue status is reported, not persisted: this endpoint stays read-only.
+    overdue_date = today - timedelta(days=OVERDUE_GRACE_DAYS)
+    overdue_vaccinations = [
+        VaccinationResponse.model_validate(vaccination).model_copy(
+            update={"status": "overdue"}
+        )
+        for vaccination in db.query(Vaccination).join(
+            Child, Vaccination.child_id == Child.id
+        ).filter(
+            Child.user_id == current_user.id,
+            Child.is_active == True,
             Vaccination.status.in_(["pending", "overdue"]),
+            Vaccination.administered_date.is_(None),
             Vaccination.scheduled_date < overdue_date
-        ).all()
-        
-        # Update status to overdue
-        for vaccination in child_overdue:
-            vaccination.status = "overdue"
-        
-        overdue_vaccinations.extend(child_overdue)
-    
-    if overdue_vaccinations:
-        db.commit()
+        ).order_by(Vaccination.child_id, Vaccination.scheduled_date)
+    ]
     
     # Get recent health records
     recent_health_records = db.query(HealthRecord).filter(
         HealthRecord.user_id == current_user.id
     ).order_by(HealthRecord.created_at.desc()).limit(5).all()
     
-    # Generate growth alerts
+    # Growth alerts from each child's whole trajectory (velocity, percentile
+    # crossings, faltering) as well as the latest percentiles, reusing the
+    # cached per-child analytics and computing the rest from one query
     growth_alerts = []
-    for child in children:
-        from .models.child import GrowthRecord
-        latest_growth = db.query(GrowthRecord).filter(
-            GrowthRecord.child_id == child.id
-        ).order_by(GrowthRecord.recorded_date.desc()).first()
-        
-        if latest_growth:
-            from .utils.growth import get_growth_alerts
-            alerts = get_growth_alerts(
-                child.age_months,
-                latest_growth.weight_percentile,
-                latest_growth.height_percentile
-            )
-            growth_alerts.extend(alerts)
-    
-    return DashboardResponse(
+    if children:
+        growth_analytics = get_growth_analytics(db, current_user.id, children)
+        for child in children:
+            growth_alerts.extend(growth_analytics[child.id].alerts)
+    
+    dashboard = DashboardResponse(
         user=current_user,
         active_pregnancy=active_pregnancy,
         children=children,
@@ -141,6 +211,9 @@ def get_dashboard_data(
         recent_health_records=recent_health_records,
         growth_alerts=growth_alerts
     )
+    
+    dashboard_cache.set(current_user.id, dashboard, ttl=seconds_until_midnight())
+    return dashboard
 
 @app.post("/pregnancy/weekly-info")
 def get_pregnancy_weekly_info(
@@ -223,6 +296,10 @@ async def chatbot_query(
         "disclaimer": "This is for informational purposes only. Always consult healthcare providers for medical advice."
     }
 
+# Same for the routes declared in this module, once all are registered
+if settings.db_async:
+    use_async_sessions(app.router)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,3 @@
+# Import every model module so the mapper registry is complete wherever
+# any model is used (CLI jobs, migrations), not only after app.main loads
+from . import user, pregnancy, child, health, job
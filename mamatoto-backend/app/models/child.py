@@ -1,5 +1,5 @@
 # app/models/child.py
-from sqlalchemy import Column, Integer, String, Date, Float, Boolean, Text, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Date, Float, Boolean, Text, ForeignKey, DateTime, Enum, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -12,6 +12,9 @@ class GenderEnum(enum.Enum):
 
 class Child(Base):
     __tablename__ = "children"
+    __table_args__ = (
+        Index("ix_children_user_id_is_active", "user_id", "is_active"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -33,11 +36,22 @@ class Child(Base):
 
 class Vaccination(Base):
     __tablename__ = "vaccinations"
+    __table_args__ = (
+        Index("ix_vaccinations_child_id_scheduled_date", "child_id", "scheduled_date"),
+        Index("ix_vaccinations_status", "status"),
+        # Partial index for overdue lookups and the sweeper (SQLite and PostgreSQL)
+        Index(
+            "ix_vaccinations_open_scheduled_date", "scheduled_date",
+            sqlite_where=text("status IN ('pending', 'overdue')"),
+            postgresql_where=text("status IN ('pending', 'overdue')")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     child_id = Column(Integer, ForeignKey("children.id"), nullable=False)
     vaccine_name = Column(String, nullable=False)
     vaccine_code = Column(String)  # WHO vaccine codes
+    schedule_id = Column(String)  # vaccination schedule the dose was planned from
     scheduled_date = Column(Date, nullable=False)
     administered_date = Column(Date)
     status = Column(String, default="pending")  # pending, completed, overdue, skipped
@@ -51,17 +65,28 @@ class Vaccination(Base):
 
 class GrowthRecord(Base):
     __tablename__ = "growth_records"
+    __table_args__ = (
+        Index("ix_growth_records_child_id_recorded_date", "child_id", "recorded_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     child_id = Column(Integer, ForeignKey("children.id"), nullable=False)
     recorded_date = Column(Date, nullable=False)
     age_months = Column(Integer)  # Age in months at recording
+    age_days = Column(Integer)  # Age in days at recording, as used by the WHO tables
     weight = Column(Float)  # in kg
     height = Column(Float)  # in cm
     head_circumference = Column(Float)  # in cm
     weight_percentile = Column(Float)
     height_percentile = Column(Float)
+    head_circumference_percentile = Column(Float)
     bmi = Column(Float)
+    # WHO z-scores (see app/utils/growth_standards.py)
+    weight_zscore = Column(Float)  # weight-for-age
+    height_zscore = Column(Float)  # length/height-for-age
+    head_circumference_zscore = Column(Float)  # head-circumference-for-age
+    bmi_zscore = Column(Float)  # BMI-for-age
+    weight_for_length_zscore = Column(Float)
     notes = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -70,9 +95,15 @@ class GrowthRecord(Base):
 
 class Milestone(Base):
     __tablename__ = "milestones"
+    __table_args__ = (
+        # Also serves lookups by child_id; custom milestones have no code
+        Index("ix_milestones_child_id_catalog_code", "child_id", "catalog_code", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     child_id = Column(Integer, ForeignKey("children.id"), nullable=False)
+    catalog_code = Column(String)  # see app/data/milestones
+    catalog_version = Column(String)
     milestone_type = Column(String, nullable=False)  # motor, language, social, cognitive
     milestone_name = Column(String, nullable=False)
     typical_age_months = Column(Integer)  # Typical age for milestone
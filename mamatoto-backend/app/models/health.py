@@ -1,11 +1,16 @@
 # app/models/health.py
-from sqlalchemy import Column, Integer, String, Date, Float, Boolean, Text, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Date, Float, Boolean, Text, ForeignKey, DateTime, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
 
 class HealthRecord(Base):
     __tablename__ = "health_records"
+    __table_args__ = (
+        Index("ix_health_records_user_id_created_at", "user_id", "created_at"),
+        Index("ix_health_records_child_id", "child_id"),
+        Index("ix_health_records_pregnancy_id", "pregnancy_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -30,6 +35,9 @@ class HealthRecord(Base):
 
 class MentalHealthAssessment(Base):
     __tablename__ = "mental_health_assessments"
+    __table_args__ = (
+        Index("ix_mental_health_assessments_user_id_created_at", "user_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -46,15 +54,20 @@ class MentalHealthAssessment(Base):
 
 class EmergencyContact(Base):
     __tablename__ = "emergency_contacts"
+    __table_args__ = (
+        Index("ix_emergency_contacts_user_id", "user_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    
+    # Relationships (declared before the "relationship" column shadows the
+    # relationship() function inside this class body)
+    user = relationship("User")
+    
     name = Column(String, nullable=False)
     relationship = Column(String)  # spouse, mother, friend, doctor
     phone = Column(String, nullable=False)
     email = Column(String)
     is_primary = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    
-    # Relationships
-    user = relationship("User")
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
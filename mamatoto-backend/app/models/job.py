@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from ..database import Base
+
+class JobLease(Base):
+    __tablename__ = "job_leases"
+    
+    # One row per background job; whoever holds an unexpired lease runs it
+    name = Column(String, primary_key=True)
+    owner = Column(String, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class JobCheckpoint(Base):
+    __tablename__ = "job_checkpoints"
+    
+    # Progress of a resumable batch job, committed with each chunk it writes
+    name = Column(String, primary_key=True)
+    position = Column(String)  # job-specific cursor, e.g. "child_id:id"
+    rows_done = Column(Integer, default=0, nullable=False)
+    completed_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
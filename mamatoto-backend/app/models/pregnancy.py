@@ -1,11 +1,20 @@
 # app/models/pregnancy.py
-from sqlalchemy import Column, Integer, String, Date, Float, Boolean, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Date, Float, Boolean, Text, ForeignKey, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
 
 class Pregnancy(Base):
     __tablename__ = "pregnancies"
+    __table_args__ = (
+        Index("ix_pregnancies_user_id_is_active", "user_id", "is_active"),
+        # Partial index for the active-pregnancy lookup (SQLite and PostgreSQL)
+        Index(
+            "ix_pregnancies_active_user_id", "user_id",
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -25,6 +34,10 @@ class Pregnancy(Base):
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        Index("ix_appointments_user_id_scheduled_date_completed", "user_id", "scheduled_date", "completed"),
+        Index("ix_appointments_pregnancy_id", "pregnancy_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     pregnancy_id = Column(Integer, ForeignKey("pregnancies.id"))
@@ -1,11 +1,19 @@
 # app/models/user.py
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Partial index for the purge job's scan (SQLite and PostgreSQL)
+        Index(
+            "ix_users_pending_deletion", "deleted_at",
+            sqlite_where=text("deleted_at IS NOT NULL"),
+            postgresql_where=text("deleted_at IS NOT NULL")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -16,6 +24,7 @@ class User(Base):
     location = Column(String)
     preferred_language = Column(String, default="en")
     is_active = Column(Boolean, default=True)
+    deleted_at = Column(DateTime)  # set by DELETE /auth/me until app.jobs.account_purge runs
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -23,3 +32,22 @@ class User(Base):
     pregnancies = relationship("Pregnancy", back_populates="user", cascade="all, delete-orphan")
     children = relationship("Child", back_populates="user", cascade="all, delete-orphan")
     health_records = relationship("HealthRecord", back_populates="user", cascade="all, delete-orphan")
+    refresh_tokens = relationship("RefreshToken", back_populates="user", cascade="all, delete-orphan")
+
+class RefreshToken(Base):
+    """
+    Server-side record of an issued refresh token. Only a SHA-256 digest of
+    the token is stored; a token is usable while it is neither expired nor
+    revoked, and is revoked as soon as it has been exchanged once.
+    """
+    __tablename__ = "refresh_tokens"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    token_hash = Column(String, unique=True, index=True, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    user = relationship("User", back_populates="refresh_tokens")
@@ -1,5 +1,5 @@
 # app/schemas/child.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime, date
 from enum import Enum
@@ -20,6 +20,9 @@ class ChildBase(BaseModel):
 class ChildCreate(ChildBase):
     pass
 
+class ChildBulkCreate(BaseModel):
+    children: List[ChildCreate] = Field(..., min_length=1, max_length=200)
+
 class ChildUpdate(BaseModel):
     name: Optional[str] = None
     gender: Optional[GenderEnum] = None
@@ -55,6 +58,23 @@ class VaccinationUpdate(BaseModel):
     healthcare_provider: Optional[str] = None
     notes: Optional[str] = None
 
+class AdministrationStatus(str, Enum):
+    completed = "completed"
+    skipped = "skipped"
+
+class VaccinationAdministration(BaseModel):
+    # The dose, by id or by vaccine code from the child's schedule
+    id: Optional[int] = None
+    vaccine_code: Optional[str] = None
+    status: AdministrationStatus = AdministrationStatus.completed
+    administered_date: Optional[date] = None  # defaults to today for completed doses
+    batch_number: Optional[str] = None
+    healthcare_provider: Optional[str] = None
+    notes: Optional[str] = None
+
+class VaccinationBatchUpdate(BaseModel):
+    vaccinations: List[VaccinationAdministration] = Field(..., min_length=1, max_length=200)
+
 class VaccinationResponse(VaccinationBase):
     id: int
     child_id: int
@@ -64,6 +84,28 @@ class VaccinationResponse(VaccinationBase):
     class Config:
         from_attributes = True
 
+class VaccinationPlanItem(BaseModel):
+    vaccination_id: Optional[int] = None
+    vaccine_code: str
+    vaccine_name: str
+    series: str
+    dose: int
+    scheduled_date: date  # recommended age
+    earliest_date: date  # minimum age and interval after the previous dose
+    due_date: date  # when to give it; the administered date once completed
+    status: str  # completed, upcoming, due, catch_up, not_eligible or skipped
+    administered_date: Optional[date] = None
+
+class VaccinationPlanResponse(BaseModel):
+    child_id: int
+    schedule_id: str
+    next_due_date: Optional[date] = None
+    doses: List[VaccinationPlanItem]
+
+class ClinicPlanEntry(VaccinationPlanItem):
+    child_id: int
+    child_name: str
+
 class GrowthRecordBase(BaseModel):
     recorded_date: date
     weight: Optional[float] = None
@@ -78,14 +120,48 @@ class GrowthRecordResponse(GrowthRecordBase):
     id: int
     child_id: int
     age_months: Optional[int]
+    age_days: Optional[int] = None
     weight_percentile: Optional[float]
     height_percentile: Optional[float]
+    head_circumference_percentile: Optional[float] = None
     bmi: Optional[float]
+    weight_zscore: Optional[float] = None
+    height_zscore: Optional[float] = None
+    head_circumference_zscore: Optional[float] = None
+    bmi_zscore: Optional[float] = None
+    weight_for_length_zscore: Optional[float] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+class GrowthTrajectory(BaseModel):
+    """Change since the previous visit with the same measurement"""
+    interval_days: Optional[float] = None
+    weight_velocity: Optional[float] = None  # kg per month
+    height_velocity: Optional[float] = None  # cm per month
+    weight_zscore_delta: Optional[float] = None
+    height_zscore_delta: Optional[float] = None
+    # Major percentile lines (P3, P15, P50, P85, P97) crossed; negative is downwards
+    weight_lines_crossed: Optional[int] = None
+    height_lines_crossed: Optional[int] = None
+    # Lines dropped since the highest band reached, or risen since the lowest
+    weight_lines_dropped: Optional[int] = None
+    weight_lines_risen: Optional[int] = None
+    height_lines_dropped: Optional[int] = None
+    faltering: bool = False
+
+class GrowthAnalyticsPoint(GrowthTrajectory):
+    growth_record_id: int
+    recorded_date: date
+    age_days: int
+
+class GrowthAnalyticsResponse(BaseModel):
+    child_id: int
+    points: List[GrowthAnalyticsPoint]
+    latest: GrowthTrajectory
+    alerts: List[str] = []
+
 class MilestoneBase(BaseModel):
     milestone_type: str
     milestone_name: str
@@ -102,9 +178,17 @@ class MilestoneUpdate(BaseModel):
     is_achieved: Optional[bool] = None
     notes: Optional[str] = None
 
+class MilestoneBatchItem(MilestoneUpdate):
+    id: int
+
+class MilestoneBatchUpdate(BaseModel):
+    milestones: List[MilestoneBatchItem] = Field(..., min_length=1, max_length=200)
+
 class MilestoneResponse(MilestoneBase):
     id: int
     child_id: int
+    catalog_code: Optional[str] = None
+    status: Optional[str] = None  # achieved, overdue, due or upcoming at the child's age
     created_at: datetime
 
     class Config:
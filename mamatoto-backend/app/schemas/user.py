@@ -33,6 +33,14 @@ class UserResponse(UserBase):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None  # access token lifetime in seconds
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 class TokenData(BaseModel):
-    user_id: Optional[int] = None
\ No newline at end of file
+    """Identity carried by an access token, available without a user lookup"""
+    id: int
+    preferred_language: str = "en"
+    is_active: bool = True
\ No newline at end of file
@@ -0,0 +1,88 @@
+# app/utils/downsample.py
+"""
+Largest-Triangle-Three-Buckets downsampling of measurement series.
+
+LTTB keeps the first and last points and splits the rest into equal
+buckets. From each bucket it keeps the point that forms the largest
+triangle with the point kept from the previous bucket and the average of
+the next one. Peaks, dips and changes of slope survive, so a chart drawn
+from a few dozen points looks like the full series.
+"""
+from typing import Optional, Sequence
+import numpy as np
+
+def _normalized_columns(y) -> np.ndarray:
+    """
+    y as an (n, k) array with every column scaled to [0, 1] and gaps filled
+    by linear interpolation, so no single measurement dominates the areas
+    """
+    y = np.asarray(y, dtype=np.float64)
+    if y.ndim == 1:
+        y = y[:, None]
+    positions = np.arange(len(y))
+    columns = []
+    for column in y.T:
+        known = np.isfinite(column)
+        if not known.any():
+            continue
+        column = np.interp(positions, positions[known], column[known])
+        spread = column.max() - column.min()
+        columns.append((column - column.min()) / spread if spread else np.zeros_like(column))
+    return np.stack(columns, axis=1) if columns else np.zeros((len(y), 1))
+
+def lttb_indices(x: Sequence[float], y, n_out: int) -> np.ndarray:
+    """
+    Indices of the n_out points LTTB keeps from the series (x, y). y holds
+    one value per x, or one row of several measurements per x whose
+    triangle areas are summed.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out <= 2:
+        return np.array([0, n - 1])
+
+    y = _normalized_columns(y)
+    span = x[-1] - x[0]
+    x = (x - x[0]) / span if span else np.zeros_like(x)
+
+    every = (n - 2) / (n_out - 2)
+    kept = [0]
+    previous = 0
+    for bucket in range(n_out - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, n)
+
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean(axis=0)
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end, None]) * (next_y - y[previous])
+        ).sum(axis=1)
+
+        previous = start + int(np.argmax(areas))
+        kept.append(previous)
+    kept.append(n - 1)
+    return np.array(kept)
+
+def downsample_indices(
+    x: Sequence[float], y, max_points: int, keep: Optional[Sequence[bool]] = None
+) -> np.ndarray:
+    """
+    Sorted indices of at most max_points points chosen by LTTB, always
+    including those marked in keep. When the kept points alone exceed
+    max_points they are all returned, together with the endpoints.
+    """
+    n = len(x)
+    if max_points >= n:
+        return np.arange(n)
+
+    keep = np.zeros(n, dtype=bool) if keep is None else np.asarray(keep, dtype=bool).copy()
+    keep[[0, n - 1]] = True
+    # The endpoints are in both sets, so the union stays within max_points
+    budget = max_points - int(keep.sum()) + 2
+    if budget > 2:
+        keep[lttb_indices(x, y, budget)] = True
+    return np.flatnonzero(keep)
@@ -1,47 +1,228 @@
 # app/utils/growth.py
-from typing import Dict, Optional
+from collections import deque
+from typing import Dict, List, Optional, Sequence
 import math
+import numpy as np
+from .growth_standards import get_growth_standards, percentile_from_zscore, sex_code
+from .growth_reference import PERCENTILE_ZSCORES
 
-def calculate_percentiles(age_months: int, weight: Optional[float], 
-                         height: Optional[float], gender: str) -> Dict:
+AVERAGE_DAYS_PER_MONTH = 30.4375
+
+# The major percentile lines drawn on the charts, as z-scores
+MAJOR_LINES = np.array(sorted(PERCENTILE_ZSCORES.values()))
+CROSSING_LINES = 2  # lines crossed before a trajectory is flagged
+FALTERING_MAX_AGE_DAYS = 730  # stalled weight gain is flagged in the first two years
+FALTERING_MIN_INTERVAL_DAYS = 14
+CROSSING_WINDOW_DAYS = 183  # drifts are measured over the last six months of visits
+
+# z-score column -> percentile column stored alongside it
+PERCENTILE_COLUMNS = {
+    "weight_zscore": "weight_percentile",
+    "height_zscore": "height_percentile",
+    "head_circumference_zscore": "head_circumference_percentile",
+}
+
+def age_in_months(age_days: int) -> int:
+    """Completed months of age, as used on WHO charts"""
+    return int(age_days // AVERAGE_DAYS_PER_MONTH)
+
+def score_growth_measurements(
+    genders: Sequence[Optional[str]],
+    age_days: Sequence[int],
+    weights: Sequence[Optional[float]],
+    heights: Sequence[Optional[float]],
+    head_circumferences: Sequence[Optional[float]]
+) -> Dict[str, np.ndarray]:
     """
-    Calculate growth percentiles using simplified WHO standards
-    Note: In production, use the actual WHO growth standards tables
+    Score many measurements at once against the WHO growth standards.
+    Returns one array per GrowthRecord column (BMI, z-scores, percentiles),
+    rounded for storage, with NaN where a score does not apply.
     """
-    percentiles = {}
-    
-    # Simplified calculation - replace with actual WHO standards
-    if weight and age_months >= 0:
-        # Weight percentiles (simplified)
-        if gender.lower() == "male":
-            expected_weight = 3.3 + (age_months * 0.6)  # Simplified formula
-        else:
-            expected_weight = 3.2 + (age_months * 0.55)  # Simplified formula
-        
-        weight_z_score = (weight - expected_weight) / (expected_weight * 0.15)
-        percentiles["weight_percentile"] = norm_cdf(weight_z_score) * 100
-    
-    if height and age_months >= 0:
-        # Height percentiles (simplified)
-        if gender.lower() == "male":
-            expected_height = 50 + (age_months * 1.8)  # Simplified formula
-        else:
-            expected_height = 49.5 + (age_months * 1.75)  # Simplified formula
-        
-        height_z_score = (height - expected_height) / (expected_height * 0.1)
-        percentiles["height_percentile"] = norm_cdf(height_z_score) * 100
-    
-    # Calculate BMI if both weight and height available
-    if weight and height:
-        height_m = height / 100  # Convert cm to meters
-        bmi = weight / (height_m ** 2)
-        percentiles["bmi"] = round(bmi, 2)
-    
-    return percentiles
+    scores = get_growth_standards().score(
+        [sex_code(gender) for gender in genders],
+        age_days, weights, heights, head_circumferences
+    )
+    columns = {name: np.round(values, 2) for name, values in scores.items()}
+    for zscore_column, percentile_column in PERCENTILE_COLUMNS.items():
+        columns[percentile_column] = np.round(percentile_from_zscore(scores[zscore_column]), 2)
+    return columns
+
+def growth_score_rows(columns: Dict[str, np.ndarray]) -> List[Dict]:
+    """Per-measurement dicts from score_growth_measurements, NaN as None"""
+    names = list(columns)
+    return [
+        {name: (None if math.isnan(value) else value) for name, value in zip(names, values)}
+        for values in zip(*(columns[name].tolist() for name in names))
+    ]
 
-def norm_cdf(x):
-    """Approximation of normal cumulative distribution function"""
-    return (1.0 + math.erf(x / math.sqrt(2.0))) / 2.0
+def calculate_percentiles(age_days: int, weight: Optional[float],
+                         height: Optional[float], head_circumference: Optional[float],
+                         gender: Optional[str]) -> Dict:
+    """
+    WHO z-scores and percentiles of one measurement; the percentile of a
+    child whose sex is not male or female is left empty
+    """
+    columns = score_growth_measurements(
+        [gender], [age_days], [weight], [height], [head_circumference]
+    )
+    return growth_score_rows(columns)[0]
+
+def _change_since_previous(x: np.ndarray, values: np.ndarray):
+    """
+    Change of values, and of x, since the previous visit that has a value;
+    NaN where either visit lacks one
+    """
+    valid = np.isfinite(values)
+    positions = np.arange(len(values))
+    last_valid = np.maximum.accumulate(np.where(valid, positions, -1))
+    previous = np.concatenate(([-1], last_valid[:-1]))
+    has_previous = valid & (previous >= 0)
+    previous = np.where(previous >= 0, previous, 0)
+    return (
+        np.where(has_previous, values - values[previous], np.nan),
+        np.where(has_previous, x - x[previous], np.nan),
+    )
+
+def _bands(zscores: np.ndarray) -> np.ndarray:
+    """Index of the space between major lines each z-score falls in, NaN if missing"""
+    bands = np.searchsorted(MAJOR_LINES, zscores, side="right").astype(np.float64)
+    return np.where(np.isfinite(zscores), bands, np.nan)
+
+def _window_extremes(x: np.ndarray, values: np.ndarray, window: float):
+    """
+    Highest and lowest of values over the visits in the window of x that
+    ends at each visit, skipping NaN; NaN where the window has none. x must
+    be sorted. Monotonic queues of the window's candidates make this O(n).
+    """
+    ages = x.tolist()
+    items = values.tolist()
+    n = len(ages)
+    highest = np.full(n, np.nan)
+    lowest = np.full(n, np.nan)
+    high, low = deque(), deque()  # indices; values decreasing / increasing
+    end = 0
+    for i, age in enumerate(ages):
+        # Admit every visit up to this age, including later ones on the same day
+        while end < n and ages[end] <= age:
+            value = items[end]
+            if value == value:  # not NaN
+                while high and items[high[-1]] <= value:
+                    high.pop()
+                high.append(end)
+                while low and items[low[-1]] >= value:
+                    low.pop()
+                low.append(end)
+            end += 1
+        while high and ages[high[0]] < age - window:
+            high.popleft()
+        while low and ages[low[0]] < age - window:
+            low.popleft()
+        if high:
+            highest[i] = items[high[0]]
+            lowest[i] = items[low[0]]
+    return highest, lowest
+
+def analyze_growth_series(
+    age_days: Sequence[int],
+    weights: Sequence[Optional[float]],
+    heights: Sequence[Optional[float]],
+    weight_zscores: Sequence[Optional[float]],
+    height_zscores: Sequence[Optional[float]]
+) -> Dict[str, np.ndarray]:
+    """
+    Trajectory of one child's visits, ordered by age. Every returned array
+    has one entry per visit, compared with the previous visit that has the
+    same measurement:
+
+    - weight/height velocity in kg or cm per month
+    - z-score deltas and signed major percentile lines crossed
+    - lines dropped since the highest band reached in the last
+      CROSSING_WINDOW_DAYS, and risen since the lowest, so slow drifts
+      across several visits are caught too and clear once growth has held
+      its band for that long
+    - faltering: weight dropped across CROSSING_LINES lines, gain stalled
+      over at least FALTERING_MIN_INTERVAL_DAYS in the first two years,
+      or weight below -2 SD and still falling
+    """
+    age = np.asarray(age_days, dtype=np.float64)
+    weight = np.array([np.nan if v is None else v for v in weights], dtype=np.float64)
+    height = np.array([np.nan if v is None else v for v in heights], dtype=np.float64)
+    weight_z = np.array([np.nan if v is None else v for v in weight_zscores], dtype=np.float64)
+    height_z = np.array([np.nan if v is None else v for v in height_zscores], dtype=np.float64)
+
+    weight_change, weight_interval = _change_since_previous(age, weight)
+    height_change, height_interval = _change_since_previous(age, height)
+    weight_z_change, _ = _change_since_previous(age, weight_z)
+    height_z_change, _ = _change_since_previous(age, height_z)
+
+    weight_bands = _bands(weight_z)
+    height_bands = _bands(height_z)
+    weight_lines_crossed, _ = _change_since_previous(age, weight_bands)
+    height_lines_crossed, _ = _change_since_previous(age, height_bands)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight_velocity = np.where(
+            weight_interval > 0, weight_change / weight_interval * AVERAGE_DAYS_PER_MONTH, np.nan
+        )
+        height_velocity = np.where(
+            height_interval > 0, height_change / height_interval * AVERAGE_DAYS_PER_MONTH, np.nan
+        )
+        weight_highest, weight_lowest = _window_extremes(age, weight_bands, CROSSING_WINDOW_DAYS)
+        height_highest, _ = _window_extremes(age, height_bands, CROSSING_WINDOW_DAYS)
+        weight_drop = weight_highest - weight_bands
+        weight_rise = weight_bands - weight_lowest
+        height_drop = height_highest - height_bands
+
+        faltering = np.isfinite(weight) & (
+            (weight_drop >= CROSSING_LINES)
+            | ((age < FALTERING_MAX_AGE_DAYS)
+               & (weight_interval >= FALTERING_MIN_INTERVAL_DAYS)
+               & (weight_change <= 0))
+            | ((weight_z < -2) & (weight_z_change < 0))
+        )
+
+    return {
+        "interval_days": np.fmin(weight_interval, height_interval),
+        "weight_velocity": np.round(weight_velocity, 3),
+        "height_velocity": np.round(height_velocity, 2),
+        "weight_zscore_delta": np.round(weight_z_change, 2),
+        "height_zscore_delta": np.round(height_z_change, 2),
+        "weight_lines_crossed": weight_lines_crossed,
+        "height_lines_crossed": height_lines_crossed,
+        "weight_lines_dropped": weight_drop,
+        "weight_lines_risen": weight_rise,
+        "height_lines_dropped": height_drop,
+        "faltering": faltering,
+    }
+
+def latest_growth_signals(
+    series: Dict[str, np.ndarray], weights: Sequence[Optional[float]]
+) -> Dict:
+    """
+    The most recent known value of every analyze_growth_series array;
+    faltering is judged at the latest visit that recorded a weight
+    """
+    latest = {}
+    for name, values in series.items():
+        if name == "faltering":
+            continue
+        known = np.flatnonzero(np.isfinite(values))
+        latest[name] = values[known[-1]].item() if len(known) else None
+
+    weighed = np.flatnonzero([weight is not None for weight in weights])
+    latest["faltering"] = bool(series["faltering"][weighed[-1]]) if len(weighed) else False
+    return latest
+
+def get_trajectory_alerts(latest: Dict) -> List[str]:
+    """Alerts from the trajectory signals of a child's latest visits"""
+    alerts = []
+    if latest.get("faltering"):
+        alerts.append("Growth faltering detected - consider nutritional assessment")
+    if (latest.get("weight_lines_risen") or 0) >= CROSSING_LINES:
+        alerts.append("Weight has risen across two percentile lines - monitor for obesity risk")
+    if (latest.get("height_lines_dropped") or 0) >= CROSSING_LINES:
+        alerts.append("Height has dropped across two percentile lines - consider growth assessment")
+    return alerts
 
 def get_growth_alerts(child_age_months: int, weight_percentile: Optional[float], 
                      height_percentile: Optional[float]) -> list:
@@ -0,0 +1,106 @@
+# app/utils/growth_reference.py
+"""
+Reference percentile curves (P3, P15, P50, P85, P97) of the WHO growth
+standards, for drawing bands behind a child's measurements.
+
+Every indicator/sex curve is computed once, at each configured resolution,
+from the LMS tables and serialized to JSON together with a strong ETag.
+The result is read-only and shared by every request, so serving a curve
+is a dict lookup and never touches NumPy or the JSON encoder.
+"""
+import hashlib
+import json
+import math
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+import numpy as np
+from ..config import settings
+from .growth_standards import INDICATORS, SEXES, GrowthStandards, get_growth_standards
+
+# Percentile -> z-score of the standard normal distribution
+PERCENTILE_ZSCORES = {
+    3: -1.880794,
+    15: -1.036433,
+    50: 0.0,
+    85: 1.036433,
+    97: 1.880794,
+}
+
+# Indicator -> GrowthRecord columns plotted against it: (x, y, z-score)
+CHART_COLUMNS = {
+    "wfa": ("age_days", "weight", "weight_zscore"),
+    "lhfa": ("age_days", "height", "height_zscore"),
+    "hcfa": ("age_days", "head_circumference", "head_circumference_zscore"),
+    "bmi": ("age_days", "bmi", "bmi_zscore"),
+    "wfl": ("height", "weight", "weight_for_length_zscore"),
+    "wfh": ("height", "weight", "weight_for_length_zscore"),
+}
+
+class ReferenceCurve(NamedTuple):
+    body: bytes  # serialized JSON payload
+    etag: str
+
+def indicator_steps(indicator: str) -> List[float]:
+    """Configured resolutions of an indicator, in its x unit; the first is the default"""
+    _, unit = INDICATORS[indicator]
+    return settings.growth_reference_length_steps if unit == "cm" else settings.growth_reference_age_steps
+
+def curve_payload(standards: GrowthStandards, indicator: str, sex: str, step: float) -> Dict:
+    table = standards.tables[indicator]
+    _, unit = INDICATORS[indicator]
+    every = max(int(round(step / table.step)), 1)
+    rows = np.arange(0, table.size, every)
+    if rows[-1] != table.size - 1:
+        rows = np.append(rows, table.size - 1)  # always reach the end of the table
+
+    sex_row = SEXES[sex]
+    l, m, s = (column[sex_row, rows] for column in (table.l, table.m, table.s))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        curves = {
+            f"P{percentile}": np.where(
+                np.abs(l) < 1e-9, m * np.exp(s * z), m * (1.0 + l * s * z) ** (1.0 / l)
+            )
+            for percentile, z in PERCENTILE_ZSCORES.items()
+        }
+
+    return {
+        "indicator": indicator,
+        "sex": sex,
+        "x_unit": unit,
+        "step": step,
+        "version": standards.version,
+        "x": np.round(table.x0 + rows * table.step, 4).tolist(),
+        "percentiles": {name: np.round(values, 3).tolist() for name, values in curves.items()},
+    }
+
+def build_reference_curves(
+    standards: GrowthStandards
+) -> Mapping[Tuple[str, str, float], ReferenceCurve]:
+    curves = {}
+    for indicator in INDICATORS:
+        for sex in SEXES:
+            for step in indicator_steps(indicator):
+                body = json.dumps(
+                    curve_payload(standards, indicator, sex, step), separators=(",", ":")
+                ).encode()
+                etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+                curves[(indicator, sex, float(step))] = ReferenceCurve(body, etag)
+    return MappingProxyType(curves)
+
+@lru_cache(maxsize=None)
+def get_reference_curves() -> Mapping[Tuple[str, str, float], ReferenceCurve]:
+    """Every curve of the process-wide standards, built on first use"""
+    return build_reference_curves(get_growth_standards())
+
+def get_reference_curve(indicator: str, sex: str, step: Optional[float] = None) -> Optional[ReferenceCurve]:
+    """The curve at step (the indicator's default when None), or None if not built"""
+    if indicator not in INDICATORS or sex not in SEXES:
+        return None
+    steps = indicator_steps(indicator)
+    if step is None:
+        step = steps[0]
+    for configured in steps:
+        if math.isclose(configured, step):
+            return get_reference_curves()[(indicator, sex, float(configured))]
+    return None
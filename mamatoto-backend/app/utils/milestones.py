@@ -0,0 +1,146 @@
+# app/utils/milestones.py
+"""
+Developmental milestone catalog and its age index.
+
+The catalog of the configured version (app/data/milestones/<version>.csv)
+is read once into an immutable MilestoneCatalog. Every age at which some
+milestone becomes due or overdue is a boundary; between two consecutive
+boundaries the status of every milestone is the same, so the catalog
+precomputes one bucket per interval. Classifying milestones at a child's
+age is then a bisect over the boundaries, O(log n), instead of a scan of
+the catalog.
+"""
+import csv
+from bisect import bisect_right
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+from ..config import settings
+from .growth import AVERAGE_DAYS_PER_MONTH
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "milestones"
+
+MILESTONE_STATUSES = ("achieved", "overdue", "due", "upcoming")
+
+class MilestoneDefinition(NamedTuple):
+    code: str
+    milestone_type: str
+    milestone_name: str
+    typical_age_months: float
+    overdue_age_months: float
+
+class AgeBucket(NamedTuple):
+    """Catalog milestones by status for every age in one interval"""
+    overdue: Tuple[str, ...]
+    due: Tuple[str, ...]
+    upcoming: Tuple[str, ...]
+    status: Mapping[str, str]  # code -> status
+
+class MilestoneCatalog:
+    def __init__(self, version: str, definitions: Iterable[MilestoneDefinition]):
+        self.version = version
+        self.definitions: Tuple[MilestoneDefinition, ...] = tuple(
+            sorted(definitions, key=lambda definition: (definition.typical_age_months, definition.code))
+        )
+        self.by_code: Mapping[str, MilestoneDefinition] = MappingProxyType(
+            {definition.code: definition for definition in self.definitions}
+        )
+        self.boundaries: Tuple[float, ...] = tuple(sorted({
+            age
+            for definition in self.definitions
+            for age in (definition.typical_age_months, definition.overdue_age_months)
+        }))
+        # buckets[i] covers ages from boundaries[i - 1] up to boundaries[i]
+        lower_bounds = (float("-inf"),) + self.boundaries
+        self.buckets: Tuple[AgeBucket, ...] = tuple(
+            self._bucket(age) for age in lower_bounds
+        )
+
+    def _bucket(self, age_months: float) -> AgeBucket:
+        status = {
+            definition.code: classify_age(
+                age_months, definition.typical_age_months, definition.overdue_age_months
+            )
+            for definition in self.definitions
+        }
+        return AgeBucket(
+            overdue=tuple(code for code, value in status.items() if value == "overdue"),
+            due=tuple(code for code, value in status.items() if value == "due"),
+            upcoming=tuple(code for code, value in status.items() if value == "upcoming"),
+            status=MappingProxyType(status),
+        )
+
+    def bucket_at(self, age_months: float) -> AgeBucket:
+        return self.buckets[bisect_right(self.boundaries, age_months)]
+
+    def status_of(self, code: Optional[str], age_months: float) -> Optional[str]:
+        """Status of a catalog milestone not yet achieved; None for codes not in this catalog"""
+        if code is None:
+            return None
+        return self.bucket_at(age_months).status.get(code)
+
+def classify_age(age_months: float, typical_age_months: float,
+                 overdue_age_months: Optional[float]) -> str:
+    if overdue_age_months is not None and age_months >= overdue_age_months:
+        return "overdue"
+    if age_months >= typical_age_months:
+        return "due"
+    return "upcoming"
+
+def load_catalog(version: str, data_dir: Path = DATA_DIR) -> MilestoneCatalog:
+    with open(data_dir / f"{version}.csv", newline="") as catalog_file:
+        definitions = [
+            MilestoneDefinition(
+                code=row["code"],
+                milestone_type=row["milestone_type"],
+                milestone_name=row["milestone_name"],
+                typical_age_months=float(row["typical_age_months"]),
+                overdue_age_months=float(row["overdue_age_months"]),
+            )
+            for row in csv.DictReader(catalog_file)
+        ]
+    codes = [definition.code for definition in definitions]
+    if len(set(codes)) != len(codes):
+        raise ValueError(f"Milestone catalog {version} has duplicate codes")
+    return MilestoneCatalog(version, definitions)
+
+@lru_cache(maxsize=None)
+def get_milestone_catalog() -> MilestoneCatalog:
+    """The configured catalog, loaded on first use"""
+    return load_catalog(settings.milestone_catalog_version)
+
+def age_in_fractional_months(birth_date: date, current_date: date) -> float:
+    return (current_date - birth_date).days / AVERAGE_DAYS_PER_MONTH
+
+def get_milestone_status(milestone, age_months: float,
+                         catalog: Optional[MilestoneCatalog] = None) -> str:
+    """
+    Status to report for a stored milestone at the child's age. Catalog
+    milestones use the catalog's windows; custom ones are due from their
+    typical age and never overdue.
+    """
+    if milestone.is_achieved:
+        return "achieved"
+    catalog = catalog or get_milestone_catalog()
+    status = catalog.status_of(milestone.catalog_code, age_months)
+    if status is not None:
+        return status
+    return classify_age(age_months, milestone.typical_age_months or 0, None)
+
+def build_milestone_rows(child_id: int, catalog: Optional[MilestoneCatalog] = None) -> List[Dict]:
+    """A child's catalog milestones, ready for a multi-row INSERT"""
+    catalog = catalog or get_milestone_catalog()
+    return [
+        {
+            "child_id": child_id,
+            "catalog_code": definition.code,
+            "catalog_version": catalog.version,
+            "milestone_type": definition.milestone_type,
+            "milestone_name": definition.milestone_name,
+            "typical_age_months": round(definition.typical_age_months),
+            "is_achieved": False,
+        }
+        for definition in catalog.definitions
+    ]
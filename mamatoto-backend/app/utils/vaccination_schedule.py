@@ -0,0 +1,178 @@
+# app/utils/vaccination_schedule.py
+"""
+Vaccination schedules and catch-up planning.
+
+A schedule (app/data/vaccination/<schedule id>.csv) is compiled once into
+an immutable VaccinationSchedule. It holds one NumPy array per dose
+attribute, and doses are ordered so that every dose follows the dose
+before it in its series. Planning then walks the doses once, each step
+vectorized over any number of children:
+
+- a dose is valid from ``min_age_days`` of age and ``min_interval_days``
+  after the previous dose of its series (given, or as planned)
+- it is planned at its recommended age, or later if that is not yet valid
+- a dose whose planned date has passed is re-planned from today (catch-up),
+  which pushes later doses of the series back by their intervals
+- past ``max_age_days`` a dose is no longer given
+
+Dates are handled as proleptic Gregorian ordinals (date.toordinal()).
+"""
+import csv
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence
+import numpy as np
+from ..config import settings
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data" / "vaccination"
+
+NOT_GIVEN = -1  # ordinal of a dose that has not been administered
+
+# Plan statuses, indexed by the codes plan() returns
+PLAN_STATUSES = ("completed", "upcoming", "due", "catch_up", "not_eligible")
+COMPLETED, UPCOMING, DUE, CATCH_UP, NOT_ELIGIBLE = range(len(PLAN_STATUSES))
+
+class ScheduledDose(NamedTuple):
+    code: str
+    name: str
+    series: str
+    dose: int
+    recommended_age_days: int
+    min_age_days: int
+    min_interval_days: int
+    max_age_days: Optional[int]
+    description: str
+
+class VaccinationSchedule:
+    def __init__(self, schedule_id: str, doses: Iterable[ScheduledDose]):
+        self.schedule_id = schedule_id
+        self.doses = tuple(sorted(
+            doses, key=lambda dose: (dose.recommended_age_days, dose.series, dose.dose)
+        ))
+        self.index: Mapping[str, int] = MappingProxyType(
+            {dose.code: position for position, dose in enumerate(self.doses)}
+        )
+        if len(self.index) != len(self.doses):
+            raise ValueError(f"Vaccination schedule {schedule_id} has duplicate codes")
+
+        # Position of the previous dose of the same series, -1 for the first
+        previous = []
+        last_in_series: Dict[str, ScheduledDose] = {}
+        for dose in self.doses:
+            before = last_in_series.get(dose.series)
+            if before is not None and before.dose >= dose.dose:
+                raise ValueError(
+                    f"Vaccination schedule {schedule_id}: {dose.code} is recommended "
+                    f"before an earlier dose of {dose.series}"
+                )
+            previous.append(self.index[before.code] if before else -1)
+            last_in_series[dose.series] = dose
+
+        self.previous = _frozen(previous, np.intp)
+        self.recommended_age_days = _frozen([dose.recommended_age_days for dose in self.doses])
+        self.min_age_days = _frozen([dose.min_age_days for dose in self.doses])
+        self.min_interval_days = _frozen([dose.min_interval_days for dose in self.doses])
+        self.max_age_days = _frozen([
+            np.iinfo(np.int64).max // 2 if dose.max_age_days is None else dose.max_age_days
+            for dose in self.doses
+        ])
+
+    @property
+    def codes(self) -> List[str]:
+        return [dose.code for dose in self.doses]
+
+    def scheduled_dates(self, birth_dates: np.ndarray) -> np.ndarray:
+        """Recommended date ordinals, shape (children, doses)"""
+        return np.asarray(birth_dates, dtype=np.int64)[:, None] + self.recommended_age_days
+
+    def plan(self, birth_dates: Sequence[int], administered: np.ndarray, today: int) -> Dict[str, np.ndarray]:
+        """
+        Plan every dose of every child. birth_dates holds one ordinal per
+        child; administered is (children, doses) with the ordinal of each
+        dose given, or NOT_GIVEN. Returns (children, doses) arrays of
+        scheduled, earliest and due date ordinals and status codes
+        (indexes into PLAN_STATUSES).
+        """
+        birth = np.asarray(birth_dates, dtype=np.int64)
+        administered = np.asarray(administered, dtype=np.int64)
+        given = administered != NOT_GIVEN
+        scheduled = self.scheduled_dates(birth)
+        earliest = np.empty_like(scheduled)
+        due = np.empty_like(scheduled)
+        too_old = np.empty_like(given)
+
+        for position in range(len(self.doses)):
+            earliest[:, position] = birth + self.min_age_days[position]
+            before = self.previous[position]
+            if before >= 0:
+                # The previous dose as given, or as planned if it is still to
+                # come; one the child is too old for no longer holds this back
+                previous_date = np.where(given[:, before], administered[:, before], due[:, before])
+                constrained = given[:, before] | ~too_old[:, before]
+                earliest[:, position] = np.where(
+                    constrained,
+                    np.maximum(earliest[:, position], previous_date + self.min_interval_days[position]),
+                    earliest[:, position]
+                )
+            planned = np.maximum(scheduled[:, position], earliest[:, position])
+            due[:, position] = np.where(
+                planned < today, np.maximum(today, earliest[:, position]), planned
+            )
+            too_old[:, position] = due[:, position] > birth + self.max_age_days[position]
+
+        status = np.select(
+            [given, too_old, due > scheduled, due <= today],
+            [COMPLETED, NOT_ELIGIBLE, CATCH_UP, DUE],
+            default=UPCOMING
+        )
+        due = np.where(given, administered, due)
+        return {"scheduled": scheduled, "earliest": earliest, "due": due, "status": status}
+
+def _frozen(values, dtype=np.int64) -> np.ndarray:
+    array = np.array(values, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+def load_schedule(schedule_id: str, data_dir: Path = DATA_DIR) -> VaccinationSchedule:
+    with open(data_dir / f"{schedule_id}.csv", newline="") as schedule_file:
+        doses = [
+            ScheduledDose(
+                code=row["code"],
+                name=row["name"],
+                series=row["series"],
+                dose=int(row["dose"]),
+                recommended_age_days=int(row["recommended_age_days"]),
+                min_age_days=int(row["min_age_days"]),
+                min_interval_days=int(row["min_interval_days"] or 0),
+                max_age_days=int(row["max_age_days"]) if row["max_age_days"] else None,
+                description=row["description"],
+            )
+            for row in csv.DictReader(schedule_file)
+        ]
+    return VaccinationSchedule(schedule_id, doses)
+
+@lru_cache(maxsize=None)
+def get_schedule(schedule_id: Optional[str] = None) -> VaccinationSchedule:
+    """A compiled schedule, the configured one by default; each is loaded once"""
+    return load_schedule(schedule_id or settings.vaccination_schedule)
+
+def administered_matrix(
+    schedule: VaccinationSchedule, child_ids: Sequence[int], doses: Iterable
+) -> np.ndarray:
+    """
+    (children, doses) ordinals of administered doses from rows with
+    child_id, vaccine_code and administered_date; codes outside the
+    schedule are ignored
+    """
+    rows = {child_id: row for row, child_id in enumerate(child_ids)}
+    administered = np.full((len(child_ids), len(schedule.doses)), NOT_GIVEN, dtype=np.int64)
+    for dose in doses:
+        position = schedule.index.get(dose.vaccine_code)
+        if position is not None and dose.administered_date is not None:
+            administered[rows[dose.child_id], position] = dose.administered_date.toordinal()
+    return administered
+
+def to_date(ordinal: int) -> date:
+    return date.fromordinal(int(ordinal))
@@ -0,0 +1,59 @@
+"""
+Tests run against a throwaway SQLite database migrated to head, set up
+before the app (and its settings) are imported.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(prefix="mamatoto-tests-"), "test.db")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+sys.path.insert(0, BACKEND_DIR)
+
+def alembic_upgrade(database_url: str):
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=BACKEND_DIR,
+        env=dict(os.environ, DATABASE_URL=database_url),
+        check=True,
+        capture_output=True
+    )
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    alembic_upgrade(os.environ["DATABASE_URL"])
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture(scope="module")
+def migrated_engine(tmp_path_factory):
+    """Engine on a fresh SQLite database built by alembic upgrade head"""
+    from sqlalchemy import create_engine
+
+    database_url = f"sqlite:///{tmp_path_factory.mktemp('migrated') / 'migrated.db'}"
+    alembic_upgrade(database_url)
+    engine = create_engine(database_url)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def register_user(client):
+    """Register a user and return the Authorization headers of a fresh login"""
+    def register(email: str, password: str = "Passw0rd!"):
+        response = client.post("/auth/register", json={
+            "email": email, "password": password, "first_name": "Test"
+        })
+        assert response.status_code == 200, response.text
+        response = client.post("/auth/login", data={"username": email, "password": password})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return register
@@ -0,0 +1,42 @@
+"""DELETE /auth/me while another purge holds the job"""
+import threading
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import SessionLocal
+from app.jobs import account_purge
+from app.models.user import User
+
+def user_row(user_id):
+    with SessionLocal() as db:
+        return db.scalars(select(User).where(User.id == user_id)).first()
+
+def current_user_id(client, headers):
+    response = client.get("/auth/me", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+def test_email_is_released_while_the_purge_is_pending(client, register_user, monkeypatch):
+    monkeypatch.setattr(settings, "account_purge_wait_seconds", 0.2)
+    headers = register_user("busy-purge@example.com")
+    user_id = current_user_id(client, headers)
+
+    with account_purge._run_lock:
+        assert client.delete("/auth/me", headers=headers).status_code == 204
+    # The queued purge gave up; the account waits for the scheduler
+    assert user_row(user_id).deleted_at is not None
+
+    register_user("busy-purge@example.com")
+    account_purge.run_purge([user_id])
+    assert user_row(user_id) is None
+
+def test_queued_purge_waits_for_a_running_one(client, register_user, monkeypatch):
+    monkeypatch.setattr(settings, "account_purge_wait_seconds", 10)
+    headers = register_user("waiting-purge@example.com")
+    user_id = current_user_id(client, headers)
+
+    account_purge._run_lock.acquire()
+    threading.Timer(0.3, account_purge._run_lock.release).start()
+    assert client.delete("/auth/me", headers=headers).status_code == 204
+    assert user_row(user_id) is None
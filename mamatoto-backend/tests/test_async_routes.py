@@ -0,0 +1,31 @@
+"""Which routes the async mode (DB_ASYNC=true) moves onto the event loop"""
+import inspect
+
+from fastapi.routing import APIRoute
+
+import app.main  # swaps the routers' routes when DB_ASYNC=true
+from app.api.child import router as child_router
+from app.api.health import router as health_router
+from app.api.pregnancy import router as pregnancy_router
+from app.config import settings
+from app.core.async_routes import SYNC_ONLY_PATHS
+
+def endpoints(path):
+    return [
+        route.endpoint
+        for router in (child_router, health_router, pregnancy_router)
+        for route in router.routes
+        if isinstance(route, APIRoute) and route.path == path
+    ]
+
+def test_cpu_heavy_routes_stay_in_the_threadpool():
+    for path in SYNC_ONLY_PATHS:
+        assert endpoints(path), path
+        for endpoint in endpoints(path):
+            assert not inspect.iscoroutinefunction(endpoint), path
+
+def test_other_database_routes_follow_the_mode():
+    for path in ("/pregnancy/", "/health/records", "/children/{child_id}/milestones"):
+        assert endpoints(path), path
+        for endpoint in endpoints(path):
+            assert inspect.iscoroutinefunction(endpoint) == settings.db_async, path
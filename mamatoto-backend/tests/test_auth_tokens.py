@@ -0,0 +1,47 @@
+"""Claims-only identity on read routes, tokens of deleted accounts and retired keys"""
+import pytest
+from sqlalchemy import event
+
+from app.config import settings
+from app.core.cache import user_cache
+from app.core.security import create_access_token, decode_token
+from app.database import engine
+
+def test_read_routes_skip_the_user_lookup(client, register_user):
+    headers = register_user("claims-only@example.com")
+    user_cache.clear()
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/children/", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 200, response.text
+    assert not [statement for statement in statements if "FROM users" in statement], statements
+
+@pytest.mark.parametrize("path", ["/children/", "/pregnancy/", "/health/records", "/dashboard"])
+def test_deleted_account_token_is_rejected(client, register_user, path):
+    headers = register_user(f"deleted{path.replace('/', '-')}@example.com")
+    assert client.get(path, headers=headers).status_code == 200
+
+    assert client.delete("/auth/me", headers=headers).status_code == 204
+    assert client.get(path, headers=headers).status_code == 401
+
+def test_token_of_a_retired_key_is_rejected_after_caching(monkeypatch):
+    monkeypatch.setattr(settings, "jwt_key_id", "old")
+    monkeypatch.setattr(settings, "secret_key", "old-secret")
+    token = create_access_token(1)
+
+    # Rotated: the old key still verifies, and its payload is now cached
+    monkeypatch.setattr(settings, "jwt_key_id", "new")
+    monkeypatch.setattr(settings, "secret_key", "new-secret")
+    monkeypatch.setattr(settings, "jwt_previous_keys", {"old": "old-secret"})
+    assert decode_token(token)["sub"] == "1"
+    assert decode_token(token)["sub"] == "1"
+
+    monkeypatch.setattr(settings, "jwt_previous_keys", {})
+    assert decode_token(token) is None
@@ -0,0 +1,16 @@
+"""POST /children/bulk returns the children in the order they were sent"""
+from datetime import date, timedelta
+
+def test_bulk_children_come_back_in_request_order(client, register_user):
+    headers = register_user("bulk-order@example.com")
+    sent = [
+        {"name": f"Newborn {number}", "birth_date": (date.today() - timedelta(days=number)).isoformat()}
+        for number in (7, 3, 11, 0, 5)
+    ]
+    response = client.post("/children/bulk", headers=headers, json={"children": sent})
+    assert response.status_code == 200, response.text
+
+    children = response.json()
+    assert [child["name"] for child in children] == [child["name"] for child in sent]
+    assert [child["birth_date"] for child in children] == [child["birth_date"] for child in sent]
+    assert len({child["id"] for child in children}) == len(sent)
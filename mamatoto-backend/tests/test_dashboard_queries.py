@@ -0,0 +1,55 @@
+"""The dashboard issues the same number of SQL statements however many children a user has"""
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app.core.cache import dashboard_cache, growth_analytics_cache, token_cache, user_cache
+from app.database import engine
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+def add_children(client, headers, count: int):
+    # Old enough that part of the vaccination schedule is overdue
+    birth_date = date.today() - timedelta(days=400)
+    response = client.post("/children/bulk", headers=headers, json={"children": [
+        {"name": f"Child {number}", "birth_date": birth_date.isoformat(), "gender": "female"}
+        for number in range(count)
+    ]})
+    assert response.status_code == 200, response.text
+    for child in response.json():
+        for months, weight, height in ((1, 4.2, 54.0), (6, 7.3, 66.0), (12, 9.0, 74.0)):
+            response = client.post(f"/children/{child['id']}/growth", headers=headers, json={
+                "child_id": child["id"],
+                "recorded_date": (birth_date + timedelta(days=30 * months)).isoformat(),
+                "weight": weight,
+                "height": height
+            })
+            assert response.status_code == 200, response.text
+
+def dashboard_statements(client, headers) -> int:
+    for cache in (dashboard_cache, growth_analytics_cache, token_cache, user_cache):
+        cache.clear()
+    with count_statements() as statements:
+        response = client.get("/dashboard", headers=headers)
+    assert response.status_code == 200, response.text
+    return len(statements)
+
+def test_dashboard_statement_count_does_not_grow_with_children(client, register_user):
+    counts = {}
+    for children in (1, 5, 20):
+        headers = register_user(f"dashboard-{children}@example.com")
+        add_children(client, headers, children)
+        counts[children] = dashboard_statements(client, headers)
+    assert counts[1] == counts[5] == counts[20], counts
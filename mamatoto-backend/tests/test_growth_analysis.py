@@ -0,0 +1,24 @@
+"""Sliding-window extremes behind the percentile-drift flags"""
+import numpy as np
+import pytest
+
+from app.utils.growth import _window_extremes
+
+def window_extremes_by_pairs(x, values, window):
+    """Every visit against every other, as the flags were first computed"""
+    in_window = (x[None, :] <= x[:, None]) & (x[None, :] >= x[:, None] - window)
+    windowed = np.where(in_window, values[None, :], np.nan)
+    with np.errstate(invalid="ignore"):
+        return np.fmax.reduce(windowed, axis=1), np.fmin.reduce(windowed, axis=1)
+
+@pytest.mark.parametrize("seed", range(20))
+def test_window_extremes_match_pairwise(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 60))
+    # Repeated ages and missing bands included
+    x = np.sort(rng.integers(0, 900, n)).astype(np.float64)
+    values = rng.integers(0, 6, n).astype(np.float64)
+    values[rng.random(n) < 0.3] = np.nan
+
+    for got, expected in zip(_window_extremes(x, values, 183), window_extremes_by_pairs(x, values, 183)):
+        np.testing.assert_array_equal(got, expected)
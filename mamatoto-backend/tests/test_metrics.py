@@ -0,0 +1,16 @@
+"""GET /metrics is hidden unless a token is configured, and requires it"""
+from app.config import settings
+
+def test_metrics_is_hidden_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", "")
+    assert client.get("/metrics").status_code == 404
+    assert client.get("/metrics", headers={"Authorization": "Bearer anything"}).status_code == 404
+
+def test_metrics_requires_the_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200, response.text
+    assert "db_pool" in response.json()
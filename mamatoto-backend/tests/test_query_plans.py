@@ -0,0 +1,152 @@
+"""
+Statements the hot endpoints and jobs actually run are answered from
+indexes. Each request goes through the app against the migrated test
+database; every statement it executes is captured and explained.
+"""
+import re
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.core.cache import dashboard_cache, growth_analytics_cache, user_cache
+from app.database import async_engine, engine
+from app.jobs.vaccination_sweeper import run_sweep
+
+# A full pass over a table, with or without an index to walk it in order
+TABLE_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)(\w+)")
+EXPLAINED = re.compile(r"^\s*(SELECT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+
+# (method, path) of the hot endpoints; {child_id} is filled in, and paged
+# lists are also requested at their second page
+HOT_ENDPOINTS = [
+    ("GET", "/dashboard"),
+    ("GET", "/children/"),
+    ("GET", "/children/{child_id}"),
+    ("GET", "/children/vaccinations/plan"),
+    ("GET", "/children/{child_id}/vaccinations?limit=2"),
+    ("GET", "/children/{child_id}/vaccinations/plan"),
+    ("GET", "/children/{child_id}/growth?limit=1"),
+    ("GET", "/children/{child_id}/growth/analytics"),
+    ("GET", "/children/{child_id}/growth/chart?indicator=wfa"),
+    ("GET", "/children/{child_id}/milestones"),
+    ("GET", "/pregnancy/?limit=1"),
+    ("GET", "/pregnancy/active"),
+    ("GET", "/pregnancy/appointments?limit=1"),
+    ("GET", "/health/records?limit=1"),
+    ("GET", "/health/mental-health?limit=1"),
+    ("GET", "/health/emergency-contacts"),
+    ("GET", "/auth/me"),
+]
+
+@contextmanager
+def captured_statements():
+    """Collect (statement, parameters) of everything the app's engines execute"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if EXPLAINED.match(statement):
+            statements.append((statement, parameters[0] if executemany else parameters))
+
+    engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+    for target in engines:
+        event.listen(target, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", capture)
+
+def table_scans(statements):
+    scans = {}
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            plan = [
+                row[-1] for row in
+                connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            ]
+            if any(TABLE_SCAN.match(detail) for detail in plan):
+                scans[statement] = plan
+    return scans
+
+@pytest.fixture(scope="module")
+def hot_user(client):
+    """A user with a record on every hot path, so no endpoint returns early"""
+    email, password = "plans@example.com", "Passw0rd!"
+    response = client.post("/auth/register", json={
+        "email": email, "password": password, "first_name": "Test"
+    })
+    assert response.status_code == 200, response.text
+    response = client.post("/auth/login", data={"username": email, "password": password})
+    assert response.status_code == 200, response.text
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    today = date.today()
+    child = client.post("/children/", headers=headers, json={
+        "name": "Amani", "birth_date": (today - timedelta(days=400)).isoformat(), "gender": "female"
+    }).json()
+    for days_ago in (300, 100):
+        client.post(f"/children/{child['id']}/growth", headers=headers, json={
+            "recorded_date": (today - timedelta(days=days_ago)).isoformat(),
+            "weight": 8.0, "height": 70.0, "head_circumference": 44.0
+        })
+    for weeks in (0, 1):
+        pregnancy = client.post("/pregnancy/", headers=headers, json={
+            "due_date": (today + timedelta(days=100 + weeks)).isoformat(), "current_week": 25
+        }).json()
+        client.post("/pregnancy/appointments", headers=headers, json={
+            "appointment_type": "antenatal", "pregnancy_id": pregnancy["id"],
+            "scheduled_date": (today + timedelta(weeks=weeks + 1)).isoformat()
+        })
+        client.post("/health/records", headers=headers, json={
+            "record_type": "checkup", "title": "Visit",
+            "recorded_date": (today - timedelta(weeks=weeks)).isoformat()
+        })
+        client.post("/health/mental-health", headers=headers, json={
+            "assessment_type": "epds", "responses": {"q1": 1},
+            "assessment_date": (today - timedelta(weeks=weeks)).isoformat()
+        })
+    client.post("/health/emergency-contacts", headers=headers, json={
+        "name": "Neema", "phone": "+255700000000", "is_primary": True
+    })
+    return {"headers": headers, "child_id": child["id"], "email": email, "password": password}
+
+@pytest.mark.parametrize("method,path", HOT_ENDPOINTS)
+def test_hot_endpoint_uses_indexes(client, hot_user, method, path):
+    url = path.format(child_id=hot_user["child_id"])
+    # A cached response would hide the statements behind it
+    for cache in (dashboard_cache, growth_analytics_cache, user_cache):
+        cache.clear()
+    with captured_statements() as statements:
+        response = client.request(method, url, headers=hot_user["headers"])
+        assert response.status_code == 200, response.text
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor:
+            response = client.request(method, f"{url}&cursor={cursor}", headers=hot_user["headers"])
+            assert response.status_code == 200, response.text
+
+    assert statements, f"{url} ran no statements"
+    assert not table_scans(statements), f"{url}: {table_scans(statements)}"
+
+def test_token_endpoints_use_indexes(client, hot_user):
+    with captured_statements() as statements:
+        response = client.post("/auth/login", data={
+            "username": hot_user["email"], "password": hot_user["password"]
+        })
+        assert response.status_code == 200, response.text
+        response = client.post("/auth/refresh", json={"refresh_token": response.json()["refresh_token"]})
+        assert response.status_code == 200, response.text
+
+    assert not table_scans(statements)
+
+def test_jobs_use_indexes(client, register_user):
+    headers = register_user("purged-plans@example.com")
+    with captured_statements() as statements:
+        run_sweep(today=date.today() + timedelta(days=365))
+        # Marks the account and purges it in a background task
+        assert client.delete("/auth/me", headers=headers).status_code == 204
+
+    assert any(statement.startswith("UPDATE vaccinations") for statement, _ in statements)
+    assert any(statement.startswith("DELETE FROM users") for statement, _ in statements)
+    assert not table_scans(statements)